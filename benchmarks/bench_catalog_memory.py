@@ -0,0 +1,95 @@
+"""
+  ------------------------------------------
+  Resident memory of many datasets held as KEDatasetDetails vs KECompactCatalog.
+
+  python benchmarks/bench_catalog_memory.py [--datasets N] [--tables N]
+  ------------------------------------------
+"""
+import argparse
+import sys
+import tracemalloc
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ke_helper import KEDatasetScanHelper, KEDatasetDetails, KECompactCatalog
+from src.ke_helper.testing import (
+    FakeDataset,
+    FakeDataplexServer,
+    FakeBigQueryClient,
+    FakeCredentials,
+)
+
+PROJECT_ID = "bench-project"
+
+
+def build_snapshots(n_datasets: int, n_tables: int) -> list:
+    datasets = [FakeDataset(PROJECT_ID, f"dataset_{i:03d}", n_tables=n_tables) for i in range(n_datasets)]
+    bq_client = FakeBigQueryClient(datasets)
+
+    snapshots = []
+    with FakeDataplexServer(datasets) as server:
+        for dataset in datasets:
+            details = (
+                KEDatasetScanHelper(
+                    PROJECT_ID,
+                    dataset.dataset_name,
+                    credentials=FakeCredentials(),
+                    bq_client=bq_client,
+                    dataplex_base_url=server.base_url,
+                )
+                .with_table_ddls(True)
+                .with_table_counts(True)
+            ).dataset_all_details
+            snapshots.append(details.model_dump())
+    return snapshots
+
+
+def resident_bytes(load) -> int:
+    tracemalloc.start()
+    held = load()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return current
+
+
+def compact_peak_bytes(catalog: KECompactCatalog) -> int:
+    """ peak allocation while compact() rebuilds the pools """
+    tracemalloc.start()
+    catalog.compact()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--datasets", type=int, default=20)
+    parser.add_argument("--tables", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    snapshots = build_snapshots(args.datasets, args.tables)
+
+    def load_models():
+        return [KEDatasetDetails(**snapshot) for snapshot in snapshots]
+
+    def load_catalog():
+        catalog = KECompactCatalog()
+        for snapshot in snapshots:
+            catalog.add(KEDatasetDetails(**snapshot))
+        return catalog
+
+    models = resident_bytes(load_models)
+    compact = resident_bytes(load_catalog)
+
+    print(f"datasets={args.datasets} tables/dataset={args.tables}")
+    print(f"KEDatasetDetails  {models / 2 ** 20:8.2f} MiB  ({models / args.datasets / 1024:8.1f} KiB/dataset)")
+    print(f"KECompactCatalog  {compact / 2 ** 20:8.2f} MiB  ({compact / args.datasets / 1024:8.1f} KiB/dataset)")
+    print(f"ratio             {compact / models:8.2f}")
+    print(f"compact() peak    {compact_peak_bytes(load_catalog()) / 2 ** 20:8.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+  ------------------------------------------
+  End-to-end benchmark of KEDatasetScanHelper.dataset_all_details
+  against the local Dataplex/BigQuery stand-ins.
+
+  python benchmarks/bench_dataset_all_details.py [--scenario NAME ...] [--json] [--phases]
+
+  The fake server runs in-process, so CPU time and peak memory include the
+  (pre-generated, cheap) serving side as well as the helper.
+  ------------------------------------------
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ke_helper import KEDatasetScanHelper, constants
+from src.ke_helper.testing import (
+    FakeDataset,
+    FakeDataplexServer,
+    FakeBigQueryClient,
+    FakeCredentials,
+)
+
+PROJECT_ID = "bench-project"
+DATASET_NAME = "bench_dataset"
+
+# name -> (dataset kwargs, server kwargs, bigquery latency, helper outputs)
+SCENARIOS = {
+    "tiny": ({"n_tables": 10}, {}, 0.0, None),
+    "small": ({"n_tables": 50}, {}, 0.0, None),
+    "medium": ({"n_tables": 500}, {}, 0.0, None),
+    "large": ({"n_tables": 2000}, {}, 0.0, None),
+    "paginated": ({"n_tables": 500}, {"page_size": 10}, 0.0, None),
+    "rate_limited": ({"n_tables": 200}, {"rate_limit_every": 10}, 0.0, None),
+    "latency_20ms": ({"n_tables": 50}, {"latency": 0.02}, 0.05, None),
+    "stale_scans": ({"n_tables": 200, "n_stale_scans": 200}, {}, 0.0, None),
+    "medium_fields_only": ({"n_tables": 500}, {}, 0.0, [constants.OUTPUT_TABLE_FIELDS]),
+}
+
+
+def run_scenario(name: str, phases: bool = False) -> dict:
+    dataset_kwargs, server_kwargs, bq_latency, outputs = SCENARIOS[name]
+    dataset = FakeDataset(PROJECT_ID, DATASET_NAME, **dataset_kwargs)
+    bq_client = FakeBigQueryClient([dataset], latency=bq_latency)
+
+    with FakeDataplexServer([dataset], **server_kwargs) as server:
+        helper = (
+            KEDatasetScanHelper(
+                PROJECT_ID,
+                DATASET_NAME,
+                credentials=FakeCredentials(),
+                bq_client=bq_client,
+                dataplex_base_url=server.base_url,
+            )
+            .with_table_ddls(True)
+            .with_table_counts(True)
+            .with_outputs(outputs)
+        )
+
+        tracemalloc.start()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        details = helper.dataset_all_details
+        wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        if phases:
+            print(f"--- {name} ---\n{helper.metrics.summary}\n")
+
+        return {
+            "scenario": name,
+            "tables": len(details.dataset_tables),
+            "wall_s": round(wall, 4),
+            "cpu_s": round(cpu, 4),
+            "peak_mib": round(peak / 2 ** 20, 2),
+            "http_requests": server.request_count,
+            "http_bytes": server.bytes_sent,
+            "http_429s": server.status_counts[429],
+            "bq_requests": bq_client.request_count,
+            "bq_jobs": bq_client.job_count,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="Scenario(s) to run; default all.")
+    parser.add_argument("--json", action="store_true", help="Emit one JSON object per scenario.")
+    parser.add_argument("--phases", action="store_true", help="Print the helper's per-phase metrics summary.")
+    args = parser.parse_args(argv)
+
+    results = [run_scenario(name, args.phases) for name in args.scenario or SCENARIOS]
+
+    if args.json:
+        for result in results:
+            print(json.dumps(result))
+        return
+
+    columns = list(results[0])
+    widths = {c: max(len(c), *(len(str(r[c])) for r in results)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for result in results:
+        print("  ".join(str(result[c]).ljust(widths[c]) for c in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+  ------------------------------------------
+  Import-time benchmark for the ke_helper package.
+
+  python benchmarks/bench_import.py [--repeat N] [--json]
+
+  Each statement runs in a fresh interpreter; the reported time is the median
+  wall time of the statement alone (interpreter start-up excluded), together
+  with which heavy dependencies it left loaded.
+  ------------------------------------------
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+HEAVY_MODULES = ("google.cloud.bigquery", "google.auth", "requests", "pydantic")
+
+STATEMENTS = {
+    "import_package": "import ke_helper",
+    "output_models": "from ke_helper import KEDatasetDetails",
+    "helper_class": "from ke_helper import KEDatasetScanHelper",
+    "bigquery_client": (
+        "from ke_helper import KEDatasetScanHelper\n"
+        "from google.cloud import bigquery"
+    ),
+}
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - start
+import json
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(statement: str, repeat: int) -> dict:
+    env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+    probe = PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+
+    samples = []
+    loaded = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", probe], env=env, check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        samples.append(result["seconds"])
+        loaded = result["loaded"]
+
+    return {"median_ms": round(statistics.median(samples) * 1000, 2), "loaded": loaded}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=7, help="Fresh interpreters per statement.")
+    parser.add_argument("--json", action="store_true", help="Emit one JSON object per statement.")
+    args = parser.parse_args(argv)
+
+    for name, statement in STATEMENTS.items():
+        result = {"statement": name, **measure(statement, args.repeat)}
+        if args.json:
+            print(json.dumps(result))
+        else:
+            print(f"{name:<18}{result['median_ms']:>10.2f} ms   loaded: {', '.join(result['loaded']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
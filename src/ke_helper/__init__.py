@@ -1,15 +1,134 @@
-from .ke_helper import KEDatasetScanHelper, NoDDScanFoundException, get_all_scans, get_scan
+"""
+  ------------------------------------------
+  Public names are loaded lazily on first access (PEP 562) so that importing
+  the package does not pull in google-cloud-bigquery, google-auth, requests or
+  the Pydantic models until they are actually used.
+  ------------------------------------------
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-from .authentication import KEAuth
+# public name -> submodule that defines it
+_LAZY_ATTRIBUTES = {
+    "KEDatasetScanHelper": ".ke_helper",
+    "NoDDScanFoundException": ".ke_helper",
+    "get_all_scans": ".ke_helper",
+    "get_scan": ".ke_helper",
+    "get_table_documentation": ".ke_helper",
 
-from .models.common_models import Schema, Query
-from .models.data_scan import DataScan
-from .models.table_scan import DDTableScan, DDTableResult
-from .models.dataset_scan import DDDatasetScan
+    "KEAuth": ".authentication",
+    "KEBuildCache": ".build_cache",
+    "KECassette": ".cassette",
+    "KEBatchEnrichment": ".enrichment",
+    "enrich_in_batches": ".enrichment",
+    "CassetteMissError": ".cassette",
 
-from .models.output_models import (
-    KEDatasetTable,
-    KEDatasetRelationship,
-    KEDatasetDetails,
-    Query
-)
\ No newline at end of file
+    "KEInstrumentation": ".instrumentation",
+    "KEListener": ".instrumentation",
+    "KEMetricsReport": ".instrumentation",
+    "KESpan": ".instrumentation",
+    "OpenTelemetryListener": ".instrumentation",
+
+    "Schema": ".models.common_models",
+    "Query": ".models.common_models",
+    "DataScan": ".models.data_scan",
+    "DDTableScan": ".models.table_scan",
+    "DDTableResult": ".models.table_scan",
+    "DDDatasetScan": ".models.dataset_scan",
+
+    "KEDatasetTable": ".models.output_models",
+    "KEDatasetRelationship": ".models.output_models",
+    "KEDatasetDetails": ".models.output_models",
+
+    "KECompactCatalog": ".catalog",
+    "CompactDatasetDetails": ".catalog",
+    "CompactTable": ".catalog",
+    "CompactRelationship": ".catalog",
+    "CompactField": ".catalog",
+    "CompactQuery": ".catalog",
+
+    "KETableSelector": ".table_selector",
+
+    "KEChange": ".diff",
+    "KEDatasetDiff": ".diff",
+    "ChangeOp": ".diff",
+    "ChangeEntity": ".diff",
+    "diff_dataset_details": ".diff",
+    "apply_changes": ".diff",
+    "changed_tables": ".diff",
+
+    "KEPrefetchScheduler": ".prefetch",
+    "KEPrefetchStatus": ".prefetch",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value # later lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .ke_helper import (
+        KEDatasetScanHelper,
+        NoDDScanFoundException,
+        get_all_scans,
+        get_scan,
+        get_table_documentation
+    )
+
+    from .authentication import KEAuth
+    from .build_cache import KEBuildCache
+    from .cassette import KECassette, CassetteMissError
+    from .enrichment import KEBatchEnrichment, enrich_in_batches
+    from .instrumentation import (
+        KEInstrumentation,
+        KEListener,
+        KEMetricsReport,
+        KESpan,
+        OpenTelemetryListener
+    )
+
+    from .models.common_models import Schema, Query
+    from .models.data_scan import DataScan
+    from .models.table_scan import DDTableScan, DDTableResult
+    from .models.dataset_scan import DDDatasetScan
+
+    from .models.output_models import (
+        KEDatasetTable,
+        KEDatasetRelationship,
+        KEDatasetDetails,
+    )
+
+    from .catalog import (
+        KECompactCatalog,
+        CompactDatasetDetails,
+        CompactTable,
+        CompactRelationship,
+        CompactField,
+        CompactQuery
+    )
+
+    from .table_selector import KETableSelector
+
+    from .diff import (
+        KEChange,
+        KEDatasetDiff,
+        ChangeOp,
+        ChangeEntity,
+        diff_dataset_details,
+        apply_changes,
+        changed_tables
+    )
+
+    from .prefetch import KEPrefetchScheduler, KEPrefetchStatus
@@ -1,25 +1,39 @@
-import requests, re
+import time
+from typing import TYPE_CHECKING
 
-from google.cloud import bigquery
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-import google.auth
+from .instrumentation import KEInstrumentation
+
+# google.auth and requests are imported on first use to keep `import ke_helper` cheap
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+
+class APIRequestError(Exception):
+    def __init__(self, message: str, status_code: int = None):
+        super().__init__(message)
+        self.status_code = status_code
 
-class APIRequestError(Exception): pass
 class AuthenticationError(APIRequestError): pass
 
 class KEAuth:
 
-    def __init__(self):
-        self.__credentials = None
+    # Status codes that are retried with exponential backoff
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+    MAX_RETRIES = 5
+    RETRY_BACKOFF_SECONDS = 0.5
+
+    def __init__(self, credentials: "Credentials" = None):
+        self.__credentials = credentials
         self.__project = None
+        self.instrumentation = KEInstrumentation()
 
-    def _get_credentials(self) -> Credentials:
+    def _get_credentials(self) -> "Credentials":
             if self.__credentials is None:
+                import google.auth
                 self.__credentials, self.__project = google.auth.default()
 
             if not self.__credentials.valid:
                 try:
+                    from google.auth.transport.requests import Request
                     self.__credentials.refresh(Request())
                 except Exception as e:
                     raise AuthenticationError(f"Failed to refresh Google credentials: {e}") from e
@@ -33,10 +47,25 @@ class KEAuth:
           "Content-Type": "application/json"
         }
 
+    def _retry_delay(self, response, attempt: int) -> float:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.RETRY_BACKOFF_SECONDS * (2 ** attempt)
+
     def get_url_content(self, url: str) -> str:
+            import requests
+
             headers = self._get_headers()
             try:
-                response = requests.get(url, headers=headers)
+                for attempt in range(self.MAX_RETRIES + 1):
+                    response = requests.get(url, headers=headers)
+                    self.instrumentation.http_response(url, response.status_code, len(response.content))
+                    if response.status_code not in self.RETRY_STATUS_CODES or attempt == self.MAX_RETRIES:
+                        break
+                    self.instrumentation.retry(url, response.status_code, attempt + 1)
+                    time.sleep(self._retry_delay(response, attempt))
+
                 response.raise_for_status() # Raises for 4xx or 5xx status codes
                 return response.text
 
@@ -44,10 +73,14 @@ class KEAuth:
                 if e.response.status_code in (401, 403):
                     raise AuthenticationError(
                         f"Access Denied (HTTP {e.response.status_code}) fetching {url}. "
-                        "Ensure your service account has the necessary IAM roles."
+                        "Ensure your service account has the necessary IAM roles.",
+                        e.response.status_code
                     ) from e
 
-                raise APIRequestError(f"HTTP Error {e.response.status_code} fetching {url}: {e.response.text}") from e
+                raise APIRequestError(
+                    f"HTTP Error {e.response.status_code} fetching {url}: {e.response.text}",
+                    e.response.status_code
+                ) from e
 
             except requests.exceptions.RequestException as e:
-                raise APIRequestError(f"Network error fetching {url}: {e}") from e
\ No newline at end of file
+                raise APIRequestError(f"Network error fetching {url}: {e}") from e
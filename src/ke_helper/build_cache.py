@@ -0,0 +1,59 @@
+"""
+  ------------------------------------------
+  Tables of previous builds, reused while their upstream scan and enrichment
+  are unchanged
+  ------------------------------------------
+"""
+import threading
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from .models.output_models import KEDatasetTable
+
+
+class CachedTable(NamedTuple):
+    scan_fingerprint: str
+    enrichment_fingerprint: str
+    table: KEDatasetTable
+
+
+class KEBuildCache:
+    """
+    Built KEDatasetTables keyed by fq table name, with the fingerprints of the
+    scan (uid, updateTime, latest job, requested outputs) and enrichment (DDL,
+    counts) they were built from. Shared by the builds of one or more datasets
+    (see KEDatasetScanHelper.with_build_cache); thread safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tables: Dict[str, CachedTable] = {}
+
+    def get(self, table_name: str) -> Optional[CachedTable]:
+        with self._lock:
+            return self._tables.get(table_name)
+
+    def put(self, table_name: str, scan_fingerprint: str, enrichment_fingerprint: str, table: KEDatasetTable):
+        with self._lock:
+            self._tables[table_name] = CachedTable(scan_fingerprint, enrichment_fingerprint, table)
+
+    def discard(self, table_name: str):
+        with self._lock:
+            self._tables.pop(table_name, None)
+
+    def retain(self, table_names: Iterable[str], prefix: str = ""):
+        """
+        drop the tables under `prefix` (e.g. "project.dataset.") that are not in
+        table_names: dropped, deselected or undocumented since the last build
+        """
+        keep = set(table_names)
+        with self._lock:
+            for table_name in [name for name in self._tables if name.startswith(prefix) and name not in keep]:
+                del self._tables[table_name]
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._tables)
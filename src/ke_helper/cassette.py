@@ -0,0 +1,233 @@
+"""
+  ------------------------------------------
+  Record/replay transport for deterministic offline runs
+  ------------------------------------------
+"""
+import gzip
+import importlib
+import json
+import os
+import threading
+import time
+from types import SimpleNamespace
+from typing import List, Union
+
+
+class CassetteMissError(Exception): pass
+
+# the only modules a replayed error may name besides this package (for APIRequestError subclasses)
+REPLAYABLE_ERROR_MODULES = ("google.api_core.exceptions",)
+
+
+def _error_to_dict(error: Exception) -> dict:
+    return {
+        "type": f"{type(error).__module__}.{type(error).__qualname__}",
+        "message": str(error),
+        "status_code": getattr(error, "status_code", None),
+    }
+
+
+def _error_from_dict(error: dict) -> Exception:
+    """
+    rebuild a recorded exception. Only APIRequestError subclasses from this package and
+    google.api_core exceptions are imported and rebuilt; a cassette is data, so any other
+    type it names becomes APIRequestError without importing anything.
+    """
+    from .authentication import APIRequestError
+
+    module_name, _, class_name = error["type"].rpartition(".")
+    package = __name__.rpartition(".")[0]
+    own_module = module_name == package or module_name.startswith(f"{package}.")
+
+    error_class = None
+    if own_module or module_name in REPLAYABLE_ERROR_MODULES:
+        try:
+            error_class = getattr(importlib.import_module(module_name), class_name)
+        except (ImportError, AttributeError, ValueError):
+            pass
+
+    if isinstance(error_class, type) and issubclass(error_class, APIRequestError):
+        return error_class(error["message"], status_code=error["status_code"])
+    if not own_module and isinstance(error_class, type) and issubclass(error_class, Exception):
+        try:
+            return error_class(error["message"])
+        except Exception:
+            pass
+
+    return APIRequestError(error["message"], status_code=error["status_code"])
+
+
+class KECassette:
+    """
+    A gzip-compressed JSON file of Dataplex HTTP responses and BigQuery metadata results.
+
+    In RECORD mode the helper performs real calls and every response is appended to the
+    cassette; call save() (or use the cassette as a context manager) to write it out.
+    Failed calls are recorded too (exception type, message, status code) and raised
+    again on replay, so error handling and fallbacks replay like the original run.
+    In REPLAY mode responses are served from the file in recorded order per request, with
+    no credentials or network access. `latency` is slept before every replayed response:
+    a number of seconds, or RECORDED_LATENCY to reproduce the time each call originally took.
+    """
+    RECORD = "record"
+    REPLAY = "replay"
+    RECORDED_LATENCY = "recorded"
+    VERSION = 1
+
+    def __init__(self, path: str, mode: str = REPLAY, latency: Union[float, str] = 0.0):
+        if mode not in (self.RECORD, self.REPLAY):
+            raise ValueError(f"Invalid cassette mode: {mode}")
+
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._positions = {}
+        self._entries = {"http": {}, "query": {}, "list_tables": {}, "get_table": {}, "get_dataset": {}}
+
+        if self.is_replaying:
+            self.load()
+
+    @property
+    def is_replaying(self) -> bool:
+        return self.mode == self.REPLAY
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if not self.is_replaying:
+            self.save()
+
+    ## Persistence ##
+    def load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            cassette = json.load(f)
+
+        if cassette.get("version") != self.VERSION:
+            raise ValueError(f"Unsupported cassette version {cassette.get('version')} in {self.path}")
+        self._entries.update(cassette["entries"])
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump({"version": self.VERSION, "entries": self._entries}, f, default=str)
+        os.replace(tmp_path, self.path)
+
+    ## Recording and playback ##
+    def record(self, kind: str, key: str, body, elapsed: float = 0.0, error: Exception = None):
+        entry = {"body": body, "elapsed": elapsed}
+        if error is not None:
+            entry = {"error": _error_to_dict(error), "elapsed": elapsed}
+
+        with self._lock:
+            self._entries[kind].setdefault(key, []).append(entry)
+
+    def play(self, kind: str, key: str):
+        """ recorded responses for a key are replayed in order; the last one repeats """
+        with self._lock:
+            recorded = self._entries[kind].get(key)
+            if not recorded:
+                raise CassetteMissError(f"No recorded {kind} response for {key} in {self.path}")
+
+            position = self._positions.get((kind, key), 0)
+            self._positions[(kind, key)] = position + 1
+            entry = recorded[min(position, len(recorded) - 1)]
+
+        delay = entry["elapsed"] if self.latency == self.RECORDED_LATENCY else self.latency
+        if delay:
+            time.sleep(delay)
+
+        if "error" in entry:
+            raise _error_from_dict(entry["error"])
+        return entry["body"]
+
+    def call(self, kind: str, key: str, fetch):
+        """ replay `key`, or call fetch() and record its result or exception """
+        if self.is_replaying:
+            return self.play(kind, key)
+
+        start = time.perf_counter()
+        try:
+            body = fetch()
+        except Exception as e:
+            self.record(kind, key, None, time.perf_counter() - start, error=e)
+            raise e
+
+        self.record(kind, key, body, time.perf_counter() - start)
+        return body
+
+    def get_url_content(self, url: str, fetch) -> str:
+        """ replay `url`, or call fetch(url) and record the result """
+        return self.call("http", url, lambda: fetch(url))
+
+    def bigquery_client(self, client=None) -> "CassetteBigQueryClient":
+        return CassetteBigQueryClient(self, client)
+
+
+def _row_to_dict(row) -> dict:
+    return dict(row.items()) if hasattr(row, "items") else dict(vars(row))
+
+
+def _query_key(query: str, job_config=None) -> str:
+    key = " ".join(query.split())
+    parameters = getattr(job_config, "query_parameters", None)
+    if parameters:
+        values = [
+            [parameter.name, getattr(parameter, "value", getattr(parameter, "values", None))]
+            for parameter in parameters
+        ]
+        key += " -- " + json.dumps(values, default=str)
+    return key
+
+
+class _CassetteQueryJob:
+    def __init__(self, rows: List[SimpleNamespace]):
+        self._rows = rows
+
+    def result(self) -> List[SimpleNamespace]:
+        return self._rows
+
+
+class CassetteBigQueryClient:
+    """
+    Wraps a bigquery.Client (record) or stands in for one (replay) for the
+    metadata calls made by KEDatasetScanHelper.
+    """
+
+    def __init__(self, cassette: KECassette, client=None):
+        self._cassette = cassette
+        self._client = client
+
+    def _call(self, kind: str, key: str, fetch):
+        return self._cassette.call(kind, key, fetch)
+
+    def list_tables(self, dataset_ref: str) -> List[SimpleNamespace]:
+        table_ids = self._call(
+            "list_tables", dataset_ref,
+            lambda: [table.full_table_id for table in self._client.list_tables(dataset_ref)]
+        )
+        return [SimpleNamespace(full_table_id=table_id) for table_id in table_ids]
+
+    def get_table(self, table_ref: str) -> SimpleNamespace:
+        table_id = self._call(
+            "get_table", table_ref,
+            lambda: self._client.get_table(table_ref).full_table_id
+        )
+        return SimpleNamespace(full_table_id=table_id)
+
+    def get_dataset(self, dataset_ref: str) -> SimpleNamespace:
+        location = self._call(
+            "get_dataset", dataset_ref,
+            lambda: self._client.get_dataset(dataset_ref).location
+        )
+        return SimpleNamespace(location=location)
+
+    def query(self, query: str, job_config=None) -> _CassetteQueryJob:
+        def fetch():
+            job = self._client.query(query, job_config=job_config) if job_config else self._client.query(query)
+            return [_row_to_dict(row) for row in job.result()]
+
+        rows = self._call("query", _query_key(query, job_config), fetch)
+        return _CassetteQueryJob([SimpleNamespace(**row) for row in rows])
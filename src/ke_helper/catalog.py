@@ -0,0 +1,284 @@
+"""
+  ------------------------------------------
+  Compact, read-only storage for many resident KEDatasetDetails
+  ------------------------------------------
+"""
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .serialization import dumps
+from .models.output_models import (
+    KEDatasetTable,
+    KEDatasetRelationship,
+    KEDatasetDetails,
+)
+
+
+class _ReadOnly:
+    """Slotted record whose attributes are set once by the catalog."""
+    __slots__ = ()
+
+    def __init__(self, **values):
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({values})"
+
+    def _as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class _CompactOutput(_ReadOnly):
+    """Views of output models: fingerprints are carried over, list fields encode on demand."""
+    __slots__ = ()
+
+    def json_bytes(self, field_name: str) -> bytes:
+        """ compact UTF-8 JSON of a single list field, like the output models' json_bytes """
+        value = getattr(self, field_name)
+        if value is not None:
+            value = [item.model_dump() if hasattr(item, 'model_dump') else item for item in value]
+        return dumps(value)
+
+
+class CompactField(_ReadOnly):
+    """Same attributes as SchemaField; shared by every table with an identical field."""
+    __slots__ = ("name", "description")
+
+    def model_dump(self) -> dict:
+        return self._as_dict()
+
+
+class CompactQuery(_ReadOnly):
+    """Same attributes as Query; shared by every table and dataset with identical SQL."""
+    __slots__ = ("sql", "description")
+
+    def model_dump(self) -> dict:
+        return self._as_dict()
+
+
+class CompactTable(_CompactOutput):
+    """Read-only view with the same attributes as KEDatasetTable."""
+    __slots__ = (
+        "name", "overview", "fields", "queries", "ddl", "row_count",
+        "size_bytes", "partition_columns", "cluster_columns", "fingerprint",
+    )
+
+    @property
+    def fields_json(self) -> str:
+        return self.json_bytes('fields').decode('utf-8')
+
+    @property
+    def queries_json(self) -> str:
+        return self.json_bytes('queries').decode('utf-8')
+
+    @property
+    def text_field_descriptions(self) -> str:
+        field_descriptions = '```\n'
+        for field in self.fields:
+            field_descriptions += f"`{field.name}` -- Definition: {field.description}\n"
+
+        field_descriptions += '```'
+
+        return field_descriptions
+
+    def to_model(self) -> KEDatasetTable:
+        return KEDatasetTable(
+            name=self.name,
+            overview=self.overview,
+            fields=[field.model_dump() for field in self.fields],
+            queries=[query.model_dump() for query in self.queries],
+            ddl=self.ddl,
+            row_count=self.row_count,
+            size_bytes=self.size_bytes,
+            partition_columns=list(self.partition_columns) if self.partition_columns is not None else None,
+            cluster_columns=list(self.cluster_columns) if self.cluster_columns is not None else None,
+        )
+
+
+class CompactRelationship(_CompactOutput):
+    """Read-only view with the same attributes as KEDatasetRelationship."""
+    __slots__ = ("table1", "table2", "relationship", "sources", "confidence_score", "type", "fingerprint")
+
+    def model_dump(self) -> dict:
+        relationship = self._as_dict()
+        del relationship["fingerprint"]
+        relationship["sources"] = list(self.sources)
+        return relationship
+
+    def to_model(self) -> KEDatasetRelationship:
+        return KEDatasetRelationship(**self.model_dump())
+
+
+class CompactDatasetDetails(_CompactOutput):
+    """Read-only view with the same attributes as KEDatasetDetails."""
+    __slots__ = (
+        "project_id", "dataset_name", "dataset_location", "dataset_description",
+        "dataset_relationships", "dataset_queries", "dataset_tables",
+        "fingerprint", "relationships_fingerprint",
+    )
+
+    @property
+    def dataset_relationships_json(self) -> str:
+        return self.json_bytes('dataset_relationships').decode('utf-8')
+
+    @property
+    def dataset_queries_json(self) -> str:
+        return self.json_bytes('dataset_queries').decode('utf-8')
+
+    @property
+    def text_table_ddls(self) -> str:
+        table_ddls = '```\n'
+        for table in self.dataset_tables:
+            table_ddls += f"Table: {table.name}\n"
+            table_ddls += f"DDL: {table.ddl}\n"
+
+        table_ddls += '```'
+        return table_ddls
+
+    def table(self, name: str) -> Optional[CompactTable]:
+        for table in self.dataset_tables:
+            if table.name == name:
+                return table
+        return None
+
+    def to_model(self) -> KEDatasetDetails:
+        return KEDatasetDetails(
+            project_id=self.project_id,
+            dataset_name=self.dataset_name,
+            dataset_location=self.dataset_location,
+            dataset_description=self.dataset_description,
+            dataset_relationships=[r.to_model() for r in self.dataset_relationships],
+            dataset_queries=[q.model_dump() for q in self.dataset_queries],
+            dataset_tables=[t.to_model() for t in self.dataset_tables],
+        )
+
+
+class KECompactCatalog:
+    """
+    Holds many datasets in compact form. Strings are interned in a catalog-wide
+    pool and identical fields, queries and column lists are stored once, however
+    many tables and datasets repeat them.
+    """
+
+    def __init__(self):
+        self._strings: Dict[str, str] = {}
+        self._fields: Dict[Tuple[str, str], CompactField] = {}
+        self._queries: Dict[Tuple[str, str], CompactQuery] = {}
+        self._tuples: Dict[tuple, tuple] = {}
+        self._datasets: Dict[Tuple[str, str], CompactDatasetDetails] = {}
+
+    ## Pools ##
+    def _str(self, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        return self._strings.setdefault(value, value)
+
+    def _tuple(self, values: Optional[List[str]]) -> Optional[tuple]:
+        if values is None:
+            return None
+        values = tuple(self._str(v) for v in values)
+        return self._tuples.setdefault(values, values)
+
+    def _field(self, name: str, description: str) -> CompactField:
+        key = (self._str(name), self._str(description))
+        field = self._fields.get(key)
+        if field is None:
+            field = self._fields[key] = CompactField(name=key[0], description=key[1])
+        return field
+
+    def _query(self, sql: str, description: str) -> CompactQuery:
+        key = (self._str(sql), self._str(description))
+        query = self._queries.get(key)
+        if query is None:
+            query = self._queries[key] = CompactQuery(sql=key[0], description=key[1])
+        return query
+
+    ## Conversion ##
+    def _table(self, table: KEDatasetTable) -> CompactTable:
+        return CompactTable(
+            name=self._str(table.name),
+            overview=self._str(table.overview),
+            fields=tuple(self._field(f.name, f.description) for f in table.fields),
+            queries=tuple(self._query(q.sql, q.description) for q in table.queries),
+            ddl=self._str(table.ddl),
+            row_count=table.row_count,
+            size_bytes=table.size_bytes,
+            partition_columns=self._tuple(table.partition_columns),
+            cluster_columns=self._tuple(table.cluster_columns),
+            fingerprint=self._str(table.fingerprint),
+        )
+
+    def _relationship(self, relationship: KEDatasetRelationship) -> CompactRelationship:
+        return CompactRelationship(
+            table1=self._str(relationship.table1),
+            table2=self._str(relationship.table2),
+            relationship=self._str(relationship.relationship),
+            sources=self._tuple(relationship.sources),
+            confidence_score=relationship.confidence_score,
+            type=self._str(relationship.type),
+            fingerprint=self._str(relationship.fingerprint),
+        )
+
+    ## Catalog ##
+    def add(self, details: Union[KEDatasetDetails, CompactDatasetDetails]) -> CompactDatasetDetails:
+        """
+        store (or replace) a dataset; the caller can drop the Pydantic original.
+        Compact records from another catalog are accepted too.
+        """
+        compact = CompactDatasetDetails(
+            project_id=self._str(details.project_id),
+            dataset_name=self._str(details.dataset_name),
+            dataset_location=self._str(details.dataset_location),
+            dataset_description=self._str(details.dataset_description),
+            dataset_relationships=tuple(self._relationship(r) for r in details.dataset_relationships),
+            dataset_queries=tuple(self._query(q.sql, q.description) for q in details.dataset_queries),
+            dataset_tables=tuple(self._table(t) for t in details.dataset_tables),
+            # already computed by the models; carried over for ETag-style validation
+            fingerprint=details.fingerprint,
+            relationships_fingerprint=self._str(details.relationships_fingerprint),
+        )
+        self._datasets[(details.project_id, details.dataset_name)] = compact
+        return compact
+
+    def get(self, project_id: str, dataset_name: str) -> Optional[CompactDatasetDetails]:
+        return self._datasets.get((project_id, dataset_name))
+
+    def remove(self, project_id: str, dataset_name: str):
+        """
+        drop a dataset; pooled values are kept until compact() since other
+        datasets may share them
+        """
+        self._datasets.pop((project_id, dataset_name), None)
+
+    def compact(self):
+        """
+        rebuild the pools from the resident datasets, releasing unused entries.
+        Each dataset is re-pooled from its compact record and its old record is
+        dropped before the next one, so no Pydantic models are created.
+        """
+        datasets = self._datasets
+        self.__init__()
+        for key in list(datasets):
+            self.add(datasets.pop(key))
+
+    def __len__(self) -> int:
+        return len(self._datasets)
+
+    def __iter__(self) -> Iterator[CompactDatasetDetails]:
+        return iter(self._datasets.values())
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "datasets": len(self._datasets),
+            "strings": len(self._strings),
+            "fields": len(self._fields),
+            "queries": len(self._queries),
+        }
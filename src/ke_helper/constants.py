@@ -14,3 +14,29 @@ RESOURCE_TYPE_DATASET = "dataset"
 FQN_PROJECT_ID_INDEX = 4
 FQN_DATASET_ID_INDEX = 6
 FQN_TABLE_ID_INDEX = 8
+
+# Outputs that can be requested with KEDatasetScanHelper.with_outputs().
+# Table overviews and the dataset description are always fetched.
+OUTPUT_TABLE_FIELDS = "table_fields"
+OUTPUT_TABLE_QUERIES = "table_queries"
+OUTPUT_DATASET_QUERIES = "dataset_queries"
+OUTPUT_RELATIONSHIPS = "relationships"
+ALL_OUTPUTS = (
+    OUTPUT_TABLE_FIELDS,
+    OUTPUT_TABLE_QUERIES,
+    OUTPUT_DATASET_QUERIES,
+    OUTPUT_RELATIONSHIPS,
+)
+
+# Prefix of BigQuery resource names in Dataplex scans
+BIGQUERY_RESOURCE_PREFIX = "//bigquery.googleapis.com"
+
+# How long the per-location scan index used for point lookups stays fresh
+SCAN_INDEX_TTL_SECONDS = 300
+
+# KEPrefetchScheduler defaults: full rebuild cadence, change check cadence
+# (one scan listing per dataset), random delay added to both, concurrent builds
+PREFETCH_REFRESH_SECONDS = 3600
+PREFETCH_CHECK_SECONDS = 300
+PREFETCH_JITTER_SECONDS = 30
+PREFETCH_MAX_WORKERS = 4
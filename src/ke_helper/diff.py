@@ -0,0 +1,318 @@
+"""
+  ------------------------------------------
+  Structural diff and change feed between two KEDatasetDetails builds
+  ------------------------------------------
+"""
+import hashlib
+import json
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from pydantic import BaseModel, Field
+
+from .models.output_models import KEDatasetDetails, KEDatasetTable
+
+
+class ChangeOp(Enum):
+    ADDED = "added"
+    REMOVED = "removed"
+    CHANGED = "changed"
+
+
+class ChangeEntity(Enum):
+    DATASET = "dataset"
+    TABLE = "table"
+    FIELD = "field"
+    QUERY = "query"
+    RELATIONSHIP = "relationship"
+
+
+class KEChange(BaseModel):
+    """
+    A single entry in a change feed.
+    Field and query changes carry the owning table name in `table`; dataset level
+    queries have `table` set to None. `value` is the new value for added and changed
+    entities and None for removed ones.
+    """
+    op: ChangeOp
+    entity: ChangeEntity
+    key: str = Field(..., description="Identity of the entity within its parent.")
+    table: Optional[str] = Field(None, description="Owning table for field and query changes.")
+    value: Optional[dict] = None
+
+
+class KEDatasetDiff(BaseModel):
+    """
+    The structural difference between two builds of the same dataset.
+    """
+    project_id: str
+    dataset_name: str
+    changes: List[KEChange] = Field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.changes
+
+    def _table_names(self, op: ChangeOp) -> List[str]:
+        return [c.key for c in self.changes if c.entity == ChangeEntity.TABLE and c.op == op]
+
+    @property
+    def tables_added(self) -> List[str]:
+        return self._table_names(ChangeOp.ADDED)
+
+    @property
+    def tables_removed(self) -> List[str]:
+        return self._table_names(ChangeOp.REMOVED)
+
+    @property
+    def tables_changed(self) -> List[str]:
+        """ tables present in both builds whose own attributes, fields or queries changed """
+        names = []
+        for change in self.changes:
+            name = None
+            if change.entity == ChangeEntity.TABLE and change.op == ChangeOp.CHANGED:
+                name = change.key
+            elif change.entity in (ChangeEntity.FIELD, ChangeEntity.QUERY) and change.table:
+                name = change.table
+            if name and name not in names:
+                names.append(name)
+        return names
+
+    def apply(self, details: KEDatasetDetails) -> KEDatasetDetails:
+        return apply_changes(details, self.changes)
+
+
+## Hashing ##
+def _hash(value) -> str:
+    encoded = json.dumps(value, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+def _keyed(items: Iterable[dict], key_fn) -> Dict[str, dict]:
+    """ index items by key, disambiguating duplicate keys by occurrence """
+    keyed = {}
+    for item in items:
+        key = key_fn(item)
+        if key in keyed:
+            n = 1
+            while f"{key}#{n}" in keyed:
+                n += 1
+            key = f"{key}#{n}"
+        keyed[key] = item
+    return keyed
+
+
+def _field_key(field: dict) -> str:
+    return field['name']
+
+
+def _query_key(query: dict) -> str:
+    return query['sql']
+
+
+def _relationship_key(relationship: dict) -> str:
+    return f"{relationship['table1']}|{relationship['table2']}|{relationship['relationship']}"
+
+
+def _relationship_model_key(relationship) -> str:
+    return f"{relationship.table1}|{relationship.table2}|{relationship.relationship}"
+
+
+TABLE_CHILDREN = ('fields', 'queries')
+DATASET_ATTRIBUTES = ('dataset_location', 'dataset_description')
+
+
+def _table_attributes(table: dict) -> dict:
+    return {k: v for k, v in table.items() if k not in TABLE_CHILDREN}
+
+
+def _diff_keyed(
+    old: Dict[str, dict],
+    new: Dict[str, dict],
+    entity: ChangeEntity,
+    table: Optional[str] = None
+) -> List[KEChange]:
+    changes = []
+    for key, value in new.items():
+        if key not in old:
+            changes.append(KEChange(op=ChangeOp.ADDED, entity=entity, key=key, table=table, value=value))
+        elif _hash(old[key]) != _hash(value):
+            changes.append(KEChange(op=ChangeOp.CHANGED, entity=entity, key=key, table=table, value=value))
+    for key in old:
+        if key not in new:
+            changes.append(KEChange(op=ChangeOp.REMOVED, entity=entity, key=key, table=table))
+    return changes
+
+
+def _as_details(details: Union[KEDatasetDetails, dict, str]) -> KEDatasetDetails:
+    """ accepts a KEDatasetDetails, its model_dump() snapshot or its JSON snapshot """
+    if isinstance(details, str):
+        return KEDatasetDetails.model_validate_json(details)
+    if isinstance(details, dict):
+        return KEDatasetDetails(**details) # normalize defaults so fingerprints line up
+    return details
+
+
+def _as_dict(details: Union[KEDatasetDetails, dict, str]) -> dict:
+    return _as_details(details).model_dump(mode='json')
+
+
+def diff_dataset_details(
+    old: Union[KEDatasetDetails, dict, str],
+    new: Union[KEDatasetDetails, dict, str]
+) -> KEDatasetDiff:
+    """
+    Compare two builds (or snapshots) of a dataset.
+    Unchanged tables and relationships are skipped by comparing the fingerprints
+    the models already carry; only changed tables are dumped and diffed by key,
+    so the cost is linear in the size of the changes.
+    """
+    old, new = _as_details(old), _as_details(new)
+    changes = []
+
+    if old.fingerprint == new.fingerprint:
+        return KEDatasetDiff(project_id=new.project_id, dataset_name=new.dataset_name)
+
+    for attribute in DATASET_ATTRIBUTES:
+        if getattr(old, attribute) != getattr(new, attribute):
+            changes.append(KEChange(
+                op=ChangeOp.CHANGED,
+                entity=ChangeEntity.DATASET,
+                key=attribute,
+                value={'value': getattr(new, attribute)}
+            ))
+
+    old_tables = _keyed(old.dataset_tables, lambda t: t.name)
+    new_tables = _keyed(new.dataset_tables, lambda t: t.name)
+
+    for name, new_table in new_tables.items():
+        if name not in old_tables:
+            changes.append(KEChange(
+                op=ChangeOp.ADDED, entity=ChangeEntity.TABLE, key=name, value=new_table.model_dump(mode='json')
+            ))
+            continue
+
+        if old_tables[name].fingerprint == new_table.fingerprint:
+            continue
+
+        old_table, table = old_tables[name].model_dump(mode='json'), new_table.model_dump(mode='json')
+        attributes = _table_attributes(table)
+        if _hash(_table_attributes(old_table)) != _hash(attributes):
+            changes.append(KEChange(op=ChangeOp.CHANGED, entity=ChangeEntity.TABLE, key=name, value=attributes))
+
+        changes.extend(_diff_keyed(
+            _keyed(old_table['fields'], _field_key),
+            _keyed(table['fields'], _field_key),
+            ChangeEntity.FIELD, name
+        ))
+        changes.extend(_diff_keyed(
+            _keyed(old_table['queries'], _query_key),
+            _keyed(table['queries'], _query_key),
+            ChangeEntity.QUERY, name
+        ))
+
+    for name in old_tables:
+        if name not in new_tables:
+            changes.append(KEChange(op=ChangeOp.REMOVED, entity=ChangeEntity.TABLE, key=name))
+
+    changes.extend(_diff_keyed(
+        _keyed([query.model_dump(mode='json') for query in old.dataset_queries], _query_key),
+        _keyed([query.model_dump(mode='json') for query in new.dataset_queries], _query_key),
+        ChangeEntity.QUERY
+    ))
+
+    if old.relationships_fingerprint != new.relationships_fingerprint:
+        old_relationships = _keyed(old.dataset_relationships, _relationship_model_key)
+        new_relationships = _keyed(new.dataset_relationships, _relationship_model_key)
+        for key, relationship in new_relationships.items():
+            old_relationship = old_relationships.get(key)
+            if old_relationship is None or old_relationship.fingerprint != relationship.fingerprint:
+                changes.append(KEChange(
+                    op=ChangeOp.ADDED if old_relationship is None else ChangeOp.CHANGED,
+                    entity=ChangeEntity.RELATIONSHIP,
+                    key=key,
+                    value=relationship.model_dump(mode='json')
+                ))
+        for key in old_relationships:
+            if key not in new_relationships:
+                changes.append(KEChange(op=ChangeOp.REMOVED, entity=ChangeEntity.RELATIONSHIP, key=key))
+
+    return KEDatasetDiff(
+        project_id=new.project_id,
+        dataset_name=new.dataset_name,
+        changes=changes
+    )
+
+
+## Change feed ##
+def _apply_keyed(items: List[dict], changes: List[KEChange], key_fn) -> List[dict]:
+    keyed = _keyed(items, key_fn)
+    for change in changes:
+        if change.op == ChangeOp.REMOVED:
+            keyed.pop(change.key, None)
+        else:
+            keyed[change.key] = change.value
+    return list(keyed.values())
+
+
+def apply_changes(
+    details: Union[KEDatasetDetails, dict, str],
+    changes: Iterable[KEChange]
+) -> KEDatasetDetails:
+    """
+    Apply a change feed to a previous build, returning the updated KEDatasetDetails.
+    Existing entities keep their position; added entities are appended.
+    """
+    base = _as_dict(details)
+
+    dataset_changes = []
+    table_changes = []
+    child_changes: Dict[Tuple[Optional[str], ChangeEntity], List[KEChange]] = {}
+    relationship_changes = []
+
+    for change in changes:
+        if change.entity == ChangeEntity.DATASET:
+            dataset_changes.append(change)
+        elif change.entity == ChangeEntity.TABLE:
+            table_changes.append(change)
+        elif change.entity == ChangeEntity.RELATIONSHIP:
+            relationship_changes.append(change)
+        else:
+            child_changes.setdefault((change.table, change.entity), []).append(change)
+
+    for change in dataset_changes:
+        base[change.key] = change.value['value']
+
+    tables = _keyed(base['dataset_tables'], lambda t: t['name'])
+    for change in table_changes:
+        if change.op == ChangeOp.REMOVED:
+            tables.pop(change.key, None)
+        elif change.op == ChangeOp.ADDED:
+            tables[change.key] = change.value
+        else:
+            tables[change.key] = {**tables[change.key], **change.value}
+
+    for (table_name, entity), entity_changes in child_changes.items():
+        if table_name is None:
+            base['dataset_queries'] = _apply_keyed(base['dataset_queries'], entity_changes, _query_key)
+            continue
+
+        table = dict(tables[table_name])
+        if entity == ChangeEntity.FIELD:
+            table['fields'] = _apply_keyed(table['fields'], entity_changes, _field_key)
+        else:
+            table['queries'] = _apply_keyed(table['queries'], entity_changes, _query_key)
+        tables[table_name] = table
+
+    base['dataset_tables'] = list(tables.values())
+    base['dataset_relationships'] = _apply_keyed(
+        base['dataset_relationships'], relationship_changes, _relationship_key
+    )
+
+    return KEDatasetDetails(**base)
+
+
+def changed_tables(diff: KEDatasetDiff, details: KEDatasetDetails) -> List[KEDatasetTable]:
+    """ the tables in `details` that need re-embedding or re-indexing after `diff` """
+    names = set(diff.tables_added) | set(diff.tables_changed)
+    return [table for table in details.dataset_tables if table.name in names]
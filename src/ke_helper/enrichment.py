@@ -0,0 +1,178 @@
+"""
+  ------------------------------------------
+  Batch enrichment: DDLs and table counts for every dataset of a project
+  and region from one region-qualified INFORMATION_SCHEMA query each
+  ------------------------------------------
+"""
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+from .instrumentation import KEInstrumentation, PHASE_BIGQUERY_QUERY
+from .table_selector import KETableSelector
+
+if TYPE_CHECKING:
+    from google.cloud import bigquery
+    from .ke_helper import KEDatasetScanHelper
+
+
+def region_qualifier(location: str) -> str:
+    """ BigQuery dataset location ("US", "us-central1") -> "region-us", "region-us-central1" """
+    return f"region-{location.lower()}"
+
+
+class KEBatchEnrichment:
+    """
+    Shared by the KEDatasetScanHelpers of one project and location (see
+    KEDatasetScanHelper.with_batch_enrichment). The first helper that needs DDLs
+    or counts runs one region-qualified query covering every registered dataset;
+    the other helpers read their slice of the result. Datasets registered after a
+    query ran are fetched together on the next request. Each dataset's table
+    selection (with_table_list_constraints) is pushed into the query, so
+    deselected tables are not read.
+
+    bq_client defaults to the client of the helper whose request runs the query.
+    """
+
+    def __init__(self, project_id: str, location: str, bq_client: "bigquery.Client" = None):
+        self.project_id = project_id
+        self.location = location
+        self.bq_client = bq_client
+        self._lock = threading.Lock()
+        # dataset -> its helper's table selection
+        self._datasets: Dict[str, Optional[KETableSelector]] = {}
+        # kind -> dataset -> {fq table name: value}
+        self._results: Dict[str, Dict[str, dict]] = {"table_ddls": {}, "table_counts": {}}
+
+    def register(self, dataset_name: str, table_selector: KETableSelector = None):
+        with self._lock:
+            self._register(dataset_name, table_selector)
+
+        return self
+
+    def _register(self, dataset_name: str, table_selector: Optional[KETableSelector]):
+        """ caller holds self._lock; a new selection drops the dataset's fetched results """
+        if dataset_name in self._datasets and self._datasets[dataset_name] is not table_selector:
+            for results in self._results.values():
+                results.pop(dataset_name, None)
+        self._datasets[dataset_name] = table_selector
+
+    def reset(self):
+        """ drop fetched results; the next request queries the region again """
+        with self._lock:
+            for results in self._results.values():
+                results.clear()
+
+    @property
+    def datasets(self) -> List[str]:
+        with self._lock:
+            return sorted(self._datasets)
+
+    ## Queries ##
+    def _datasets_filter(self, dataset_names: List[str]) -> Tuple[str, "bigquery.QueryJobConfig"]:
+        """
+        WHERE condition selecting the datasets and, per restricted dataset, its
+        selected tables: table_schema IN UNNEST(@datasets) OR (table_schema = @ds0 AND ...)
+        """
+        from google.cloud import bigquery
+
+        conditions, parameters = [], []
+        unrestricted = [
+            name for name in dataset_names
+            if self._datasets.get(name) is None or not self._datasets[name].is_restricted
+        ]
+        if unrestricted:
+            conditions.append("table_schema IN UNNEST(@datasets)")
+            parameters.append(bigquery.ArrayQueryParameter("datasets", "STRING", unrestricted))
+
+        restricted = [name for name in dataset_names if name not in unrestricted]
+        for i, dataset_name in enumerate(restricted):
+            condition, selector_parameters = self._datasets[dataset_name].sql_filter(
+                "table_name", parameter_prefix=f"ds{i}_"
+            )
+            conditions.append(f"(table_schema = @ds{i} AND {condition})")
+            parameters.append(bigquery.ScalarQueryParameter(f"ds{i}", "STRING", dataset_name))
+            parameters.extend(selector_parameters)
+
+        return " OR ".join(conditions), bigquery.QueryJobConfig(query_parameters=parameters)
+
+    def _table_ddls_query(self, condition: str) -> str:
+        return f"""
+            SELECT
+                CONCAT(
+                    table_catalog,'.',table_schema,'.',table_name) AS fq_table_name,
+                table_schema AS dataset_name,
+                ddl
+            FROM `{self.project_id}.{region_qualifier(self.location)}.INFORMATION_SCHEMA.TABLES`
+            WHERE {condition}
+        """
+
+    def _table_counts_query(self, condition: str) -> str:
+        return f"""
+            SELECT
+                CONCAT(project_id,'.',table_schema,'.',table_name) AS fq_table_name
+            , table_schema AS dataset_name
+            , total_rows AS row_count
+            , total_logical_bytes AS size_bytes
+            FROM `{self.project_id}.{region_qualifier(self.location)}.INFORMATION_SCHEMA.TABLE_STORAGE`
+            WHERE NOT deleted
+            AND ({condition})
+        """
+
+    def _fetch(self, kind: str, dataset_names: List[str], client, instrumentation: KEInstrumentation):
+        condition, job_config = self._datasets_filter(dataset_names)
+        query = self._table_ddls_query(condition) if kind == "table_ddls" else self._table_counts_query(condition)
+
+        with instrumentation.span(PHASE_BIGQUERY_QUERY, query=f"region_{kind}", datasets=len(dataset_names)):
+            results = client.query(query, job_config=job_config).result()
+
+        fetched: Dict[str, dict] = {dataset_name: {} for dataset_name in dataset_names}
+        for row in results:
+            # not parsed from fq_table_name: domain-scoped project IDs (example.com:proj) contain dots
+            dataset_name = row.dataset_name
+            if kind == "table_ddls":
+                value = row.ddl
+            else:
+                value = {"row_count": row.row_count, "size_bytes": row.size_bytes}
+            fetched.setdefault(dataset_name, {})[row.fq_table_name] = value
+
+        return fetched
+
+    def _lookup(self, kind: str, helper: "KEDatasetScanHelper") -> dict:
+        """
+        the helper's dataset slice of `kind`. The lock is held while querying so
+        concurrent helpers wait for the one region query instead of starting their own.
+        """
+        with self._lock:
+            self._register(helper.dataset_name, helper.table_selector)
+            results = self._results[kind]
+            missing = sorted(set(self._datasets) - set(results))
+            if missing:
+                client = self.bq_client or helper._bq_client
+                results.update(self._fetch(kind, missing, client, helper.instrumentation))
+
+            return results[helper.dataset_name]
+
+    def table_ddls(self, helper: "KEDatasetScanHelper") -> dict:
+        return self._lookup("table_ddls", helper)
+
+    def table_counts(self, helper: "KEDatasetScanHelper") -> dict:
+        return self._lookup("table_counts", helper)
+
+
+def enrich_in_batches(
+    helpers: Iterable["KEDatasetScanHelper"],
+    bq_client: "bigquery.Client" = None
+) -> Dict[Tuple[str, str], KEBatchEnrichment]:
+    """
+    group helpers by project and dataset location and give each group one shared
+    KEBatchEnrichment. Returns the batches keyed by (project_id, location).
+    """
+    batches: Dict[Tuple[str, str], KEBatchEnrichment] = {}
+    for helper in helpers:
+        key = (helper.project_id, helper.dataset_location.lower())
+        batch = batches.get(key)
+        if batch is None:
+            batch = batches[key] = KEBatchEnrichment(helper.project_id, helper.dataset_location, bq_client)
+        helper.with_batch_enrichment(batch)
+
+    return batches
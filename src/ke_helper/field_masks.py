@@ -0,0 +1,83 @@
+"""
+  ------------------------------------------
+  Field masks (the `fields` system parameter) for partial Dataplex responses
+  ------------------------------------------
+"""
+from typing import Iterable
+from urllib.parse import quote
+
+from . import constants
+
+# Top level scan fields the scan models validate
+SCAN_BASE_FIELDS = (
+    "name", "uid", "state", "createTime", "updateTime", "data", "executionSpec", "executionStatus", "type"
+)
+
+LIST_SCANS_FIELDS = f"dataScans({','.join(SCAN_BASE_FIELDS)}),nextPageToken"
+
+
+def table_scan_fields(outputs: Iterable[str]) -> str:
+    """ mask for a DATA_DOCUMENTATION table scan covering `outputs` """
+    outputs = set(outputs)
+    result = ["overview"]
+    if constants.OUTPUT_TABLE_FIELDS in outputs:
+        result.append("schema")
+    if constants.OUTPUT_TABLE_QUERIES in outputs:
+        result.append("queries")
+
+    return ",".join(SCAN_BASE_FIELDS + (f"dataDocumentationResult({','.join(result)})",))
+
+
+def dataset_scan_fields(outputs: Iterable[str]) -> str:
+    """
+    mask for a DATA_DOCUMENTATION dataset scan covering `outputs`.
+    datasetResult.tableResults duplicates the table scans and is never requested.
+    """
+    outputs = set(outputs)
+    dataset_result = ["overview"]
+    if constants.OUTPUT_RELATIONSHIPS in outputs:
+        dataset_result.append("schemaRelationships")
+
+    result = [f"datasetResult({','.join(dataset_result)})"]
+    if constants.OUTPUT_DATASET_QUERIES in outputs:
+        result.append("queries")
+
+    return ",".join(SCAN_BASE_FIELDS + (
+        "description",
+        "displayName",
+        f"dataDocumentationResult({','.join(result)})",
+    ))
+
+
+def fill_omitted(scan: dict, outputs: Iterable[str], is_table: bool) -> dict:
+    """
+    Empty placeholders for the result fields the mask for `outputs` leaves out on
+    purpose, so a partial response validates against the strict scan models.
+    Anything else missing from the response still fails validation.
+    """
+    outputs = set(outputs)
+    result = scan.get("dataDocumentationResult")
+    if not isinstance(result, dict):
+        return scan
+
+    if is_table:
+        if constants.OUTPUT_TABLE_FIELDS not in outputs:
+            result.setdefault("schema", {"fields": []})
+        if constants.OUTPUT_TABLE_QUERIES not in outputs:
+            result.setdefault("queries", [])
+        return scan
+
+    if constants.OUTPUT_DATASET_QUERIES not in outputs:
+        result.setdefault("queries", [])
+    dataset_result = result.get("datasetResult")
+    if isinstance(dataset_result, dict):
+        # never requested, see dataset_scan_fields
+        dataset_result.setdefault("tableResults", [])
+        dataset_result.setdefault("queries", [])
+
+    return scan
+
+
+def with_fields(url: str, fields: str) -> str:
+    separator = "&" if "?" in url else "?"
+    return f"{url}{separator}fields={quote(fields, safe='')}"
@@ -0,0 +1,200 @@
+"""
+  ------------------------------------------
+  Per-phase instrumentation and metrics hooks for KEDatasetScanHelper
+  ------------------------------------------
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+# Phase (span) names used by the helper
+PHASE_DATASET_LOCATION = "dataset_location"
+PHASE_LIST_SCANS = "list_scans"
+PHASE_LIST_TABLES = "list_tables"
+PHASE_FETCH_SCAN = "fetch_full_scan"
+PHASE_VALIDATE = "validate"
+PHASE_BIGQUERY_QUERY = "bigquery_query"
+PHASE_BUILD_TABLES = "build_tables"
+PHASE_BUILD_RELATIONSHIPS = "build_relationships"
+PHASE_DATASET_ALL_DETAILS = "dataset_all_details"
+
+# Event names passed to KEListener.on_event
+EVENT_HTTP_RESPONSE = "http_response"
+EVENT_RETRY = "retry"
+EVENT_CACHE_HIT = "cache_hit"
+EVENT_CACHE_MISS = "cache_miss"
+
+
+class KESpan:
+    """A timed phase. Spans nest; `parent` is the enclosing span on the same thread."""
+    __slots__ = ("name", "attributes", "parent", "start_time", "end_time")
+
+    def __init__(self, name: str, attributes: dict, parent: Optional["KESpan"] = None):
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent
+        self.start_time = time.perf_counter()
+        self.end_time = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end_time or time.perf_counter()) - self.start_time
+
+
+class KEListener:
+    """Base class for instrumentation callbacks; override the hooks you need."""
+
+    def on_span_start(self, span: KESpan):
+        pass
+
+    def on_span_end(self, span: KESpan):
+        pass
+
+    def on_event(self, name: str, attributes: dict):
+        pass
+
+
+class PhaseStats(BaseModel):
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.count if self.count else 0.0
+
+
+class KEMetricsReport(BaseModel):
+    """
+    Running totals for a helper: per-phase timings, HTTP traffic, retries,
+    cache hits/misses and BigQuery job durations.
+    """
+    phases: Dict[str, PhaseStats] = Field(default_factory=dict)
+    http_requests: int = 0
+    http_bytes: int = 0
+    http_status_codes: Dict[int, int] = Field(default_factory=dict)
+    retries: int = 0
+    cache_hits: Dict[str, int] = Field(default_factory=dict)
+    cache_misses: Dict[str, int] = Field(default_factory=dict)
+    bigquery_job_seconds: List[float] = Field(default_factory=list)
+
+    @property
+    def bigquery_jobs(self) -> int:
+        return len(self.bigquery_job_seconds)
+
+    @property
+    def summary(self) -> str:
+        lines = ["phase                     count   total_s     max_s"]
+        for name, stats in sorted(self.phases.items(), key=lambda item: -item[1].total_seconds):
+            lines.append(f"{name:<24}{stats.count:>7}{stats.total_seconds:>10.3f}{stats.max_seconds:>10.3f}")
+        lines.append(f"http: {self.http_requests} requests, {self.http_bytes} bytes, "
+                     f"status {self.http_status_codes}, {self.retries} retries")
+        lines.append(f"cache: hits {self.cache_hits}, misses {self.cache_misses}")
+        lines.append(f"bigquery: {self.bigquery_jobs} jobs, {sum(self.bigquery_job_seconds):.3f}s")
+        return "\n".join(lines)
+
+
+class KEInstrumentation:
+    """
+    Collects spans and events into a KEMetricsReport and forwards them to listeners.
+    Safe to share between threads.
+    """
+
+    def __init__(self):
+        self.report = KEMetricsReport()
+        self._listeners: List[KEListener] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def add_listener(self, listener: KEListener):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: KEListener):
+        self._listeners.remove(listener)
+
+    def reset(self):
+        with self._lock:
+            self.report = KEMetricsReport()
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        parent = getattr(self._local, "span", None)
+        span = KESpan(name, attributes, parent)
+        self._local.span = span
+        for listener in self._listeners:
+            listener.on_span_start(span)
+        try:
+            yield span
+        finally:
+            span.end_time = time.perf_counter()
+            self._local.span = parent
+
+            duration = span.duration
+            with self._lock:
+                stats = self.report.phases.setdefault(name, PhaseStats())
+                stats.count += 1
+                stats.total_seconds += duration
+                stats.max_seconds = max(stats.max_seconds, duration)
+                if name == PHASE_BIGQUERY_QUERY:
+                    self.report.bigquery_job_seconds.append(duration)
+
+            for listener in self._listeners:
+                listener.on_span_end(span)
+
+    def _emit(self, name: str, attributes: dict):
+        for listener in self._listeners:
+            listener.on_event(name, attributes)
+
+    def http_response(self, url: str, status_code: int, num_bytes: int):
+        with self._lock:
+            report = self.report
+            report.http_requests += 1
+            report.http_bytes += num_bytes
+            report.http_status_codes[status_code] = report.http_status_codes.get(status_code, 0) + 1
+        self._emit(EVENT_HTTP_RESPONSE, {"url": url, "status_code": status_code, "bytes": num_bytes})
+
+    def retry(self, url: str, status_code: int, attempt: int):
+        with self._lock:
+            self.report.retries += 1
+        self._emit(EVENT_RETRY, {"url": url, "status_code": status_code, "attempt": attempt})
+
+    def cache(self, name: str, hit: bool):
+        with self._lock:
+            counts = self.report.cache_hits if hit else self.report.cache_misses
+            counts[name] = counts.get(name, 0) + 1
+        self._emit(EVENT_CACHE_HIT if hit else EVENT_CACHE_MISS, {"cache": name})
+
+
+class OpenTelemetryListener(KEListener):
+    """
+    Mirrors helper spans into OpenTelemetry spans, and events into span events.
+    Requires the optional `opentelemetry-api` package.
+    """
+
+    def __init__(self, tracer=None):
+        try:
+            from opentelemetry import context, trace
+        except ImportError as e:
+            raise ImportError("OpenTelemetryListener requires the opentelemetry-api package") from e
+
+        self._context = context
+        self._trace = trace
+        self._tracer = tracer or trace.get_tracer("ke_helper")
+        self._active = {}
+
+    def on_span_start(self, span: KESpan):
+        otel_span = self._tracer.start_span(span.name, attributes=span.attributes)
+        token = self._context.attach(self._trace.set_span_in_context(otel_span))
+        self._active[id(span)] = (otel_span, token)
+
+    def on_span_end(self, span: KESpan):
+        otel_span, token = self._active.pop(id(span), (None, None))
+        if otel_span is not None:
+            self._context.detach(token)
+            otel_span.end()
+
+    def on_event(self, name: str, attributes: dict):
+        self._trace.get_current_span().add_event(name, attributes=attributes)
@@ -6,11 +6,28 @@
 """
 import json
 import re
-from typing import List
-from google.cloud import bigquery
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 from pydantic import ValidationError
 
-from .authentication import KEAuth
+from .authentication import KEAuth, APIRequestError
+from .build_cache import KEBuildCache
+from .cassette import KECassette
+from .enrichment import KEBatchEnrichment
+from .instrumentation import (
+    KEMetricsReport,
+    PHASE_DATASET_LOCATION,
+    PHASE_LIST_SCANS,
+    PHASE_LIST_TABLES,
+    PHASE_FETCH_SCAN,
+    PHASE_VALIDATE,
+    PHASE_BIGQUERY_QUERY,
+    PHASE_BUILD_TABLES,
+    PHASE_BUILD_RELATIONSHIPS,
+    PHASE_DATASET_ALL_DETAILS,
+)
 from .models.common_models import ScanTypeValue
 from .models.data_scan import DataScan
 from .models.table_scan import DDTableScan
@@ -21,7 +38,14 @@ from .models.output_models import (
     KEDatasetDetails,
     Query
 )
+from .serialization import canonical, fingerprint
+from .table_selector import KETableSelector
 from . import constants
+from . import field_masks
+
+# google.cloud.bigquery is imported on first use to keep `import ke_helper` cheap
+if TYPE_CHECKING:
+    from google.cloud import bigquery
 
 def get_all_scans(project_id: str, location: str):
     url = KEDatasetScanHelper.DATAPLEX_LIST_SCANS_URL.format(
@@ -43,6 +67,29 @@ def get_scan(project_id: str, location: str, scan_id: str, full_view: bool = Tru
 
     return ke_auth.get_url_content(url)
 
+def get_table_documentation(
+    project_id: str,
+    dataset_name: str,
+    table_name: str,
+    dataset_location: str = None,
+    with_ddl: bool = False,
+    with_counts: bool = False,
+    **helper_kwargs
+) -> "KEDatasetTable":
+    """
+    Documentation for a single table without building the whole dataset.
+    Passing dataset_location skips the BigQuery dataset lookup; once the location's
+    scan index is cached this is a single Dataplex request (plus the optional
+    single-table BigQuery enrichment queries).
+    """
+    helper = KEDatasetScanHelper(project_id, dataset_name, dataset_location=dataset_location, **helper_kwargs)
+
+    return (
+        helper
+        .with_table_ddls(with_ddl)
+        .with_table_counts(with_counts)
+    ).table_documentation(table_name)
+
 """
   ------------------------------------------
   KEDatasetScanHelper
@@ -51,29 +98,86 @@ def get_scan(project_id: str, location: str, scan_id: str, full_view: bool = Tru
 # class NoKEScanFoundException(Exception): pass # deprecated
 class NoDDScanFoundException(Exception): pass
 
+_NO_JOB_END_TIME = datetime.min.replace(tzinfo=timezone.utc)
+_RFC3339_FRACTION = re.compile(r"\.(\d+)")
+
+
+def _job_end_time(scan: dict) -> datetime:
+    """
+    executionStatus.latestJobEndTime as a datetime. Dataplex writes RFC 3339 with up
+    to nanosecond precision and any offset, so the strings do not sort by time.
+    """
+    value = (scan.get('executionStatus') or {}).get('latestJobEndTime')
+    if not value:
+        return _NO_JOB_END_TIME
+
+    value = value.upper().replace('Z', '+00:00')
+    value = _RFC3339_FRACTION.sub(lambda m: "." + (m.group(1) + "000000")[:6], value, count=1)
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError as e:
+        print(f"Unparseable latestJobEndTime {value!r}: {e}")
+        return _NO_JOB_END_TIME
+
+
 class KEDatasetScanHelper(KEAuth):
     """A helper for interacting with the Knowledge Engine API."""
     DATAPLEX_BASE_URL = "https://dataplex.googleapis.com/v1"
     DATAPLEX_LIST_SCANS_URL = DATAPLEX_BASE_URL + "/projects/{project_id}/locations/{location}/dataScans"
 
-    def __init__(self, project_id: str, dataset_name: str):
-        super().__init__()
+    # Shared by all helpers: (list scans url, project, location) -> (built at, {resource: scan})
+    _scan_indexes: Dict[Tuple[str, str, str], Tuple[float, Dict[str, dict]]] = {}
+    _scan_indexes_lock = threading.Lock()
+    # one lock per index key, so concurrent helpers wait for a listing instead of repeating it
+    _scan_index_listing_locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+
+    # Dataplex base URLs that answered a field mask with HTTP 400 while the same request without
+    # it succeeded; later requests skip masks (see clear_field_mask_rejections)
+    _field_masks_rejected = set()
+
+    def __init__(
+        self,
+        project_id: str,
+        dataset_name: str,
+        credentials=None,
+        bq_client: "bigquery.Client" = None,
+        dataplex_base_url: str = None,
+        dataset_location: str = None
+    ):
+        """
+        credentials, bq_client and dataplex_base_url default to Application Default
+        Credentials, a bigquery.Client for project_id and the public Dataplex endpoint.
+        They can be overridden to point the helper at a local stand-in (see ke_helper.testing).
+        A known dataset_location saves the BigQuery dataset lookup.
+        """
+        super().__init__(credentials)
         self.dataset_name = dataset_name
         self.project_id = project_id
-        self.__dataset_location = None
+        if dataplex_base_url:
+            self.DATAPLEX_BASE_URL = dataplex_base_url.rstrip('/')
+            self.DATAPLEX_LIST_SCANS_URL = self.DATAPLEX_BASE_URL + "/projects/{project_id}/locations/{location}/dataScans"
+        self.__bq_client = bq_client
+        self.__cassette = None
+        self.__cassette_bq_client = None
+        self.__dataset_location = dataset_location
         self.__tables = []
         self.__data_scans = []
-        self.__allowlist_tables = set()
-        self.__blocklist_tables = set()
+        self.__table_scans = []
+        self.__table_selector = KETableSelector()
         self.__with_ddls = False
         self.__ddls = {}
         self.__with_table_counts = False
         self.__table_counts = {}
+        self.__batch_enrichment = None
+        self.__build_cache = None
+        self.__outputs = None
 
     def _flush(self):
         self.__tables.clear()
         self.__data_scans.clear()
+        self.__table_scans.clear()
         self.__ddls.clear()
+        self.__table_counts.clear()
 
     def _table_is_allowed(self, table_resource_fqn: str) -> bool:
         """
@@ -83,68 +187,207 @@ class KEDatasetScanHelper(KEAuth):
         """
         short_table_name = table_resource_fqn.split('/')[-1]
 
-        return (
-            self._is_in_allowlist(short_table_name) and not
-            self._is_in_blocklist(short_table_name)
-        )
+        return self.__table_selector.allows(short_table_name)
 
-    def _is_in_allowlist(self, short_table_name: str) -> bool:
-        if not self.__allowlist_tables:
-            return True
+    @property
+    def _bq_client(self) -> "bigquery.Client":
+        if self.__cassette:
+            if self.__cassette_bq_client is None:
+                inner = None if self.__cassette.is_replaying else self._raw_bq_client
+                self.__cassette_bq_client = self.__cassette.bigquery_client(inner)
+            return self.__cassette_bq_client
 
-        return short_table_name in self.__allowlist_tables
+        return self._raw_bq_client
 
-    def _is_in_blocklist(self, short_table_name: str) -> bool:
-        if not self.__blocklist_tables:
-            return False
+    @property
+    def _raw_bq_client(self) -> "bigquery.Client":
+        if self.__bq_client is None:
+            from google.cloud import bigquery
+            self.__bq_client = bigquery.Client(project=self.project_id)
+
+        return self.__bq_client
 
-        return short_table_name in self.__blocklist_tables
+    def get_url_content(self, url: str) -> str:
+        if self.__cassette:
+            return self.__cassette.get_url_content(url, super().get_url_content)
+
+        return super().get_url_content(url)
 
     def _get_dataset_table_names(self) -> List[str]:
         """ list of tables in shortname format """
         return_list = []
-        client = bigquery.Client()
+        client = self._bq_client
         dataset_ref = f"{self.project_id}.{self.dataset_name}"
-        for table in client.list_tables(dataset_ref):
-            return_list.append(table.full_table_id.split(".")[-1])
+        with self.instrumentation.span(PHASE_LIST_TABLES, dataset=dataset_ref):
+            for table in client.list_tables(dataset_ref):
+                short_table_name = table.full_table_id.split(".")[-1]
+                if self.__table_selector.allows(short_table_name):
+                    return_list.append(short_table_name)
 
         return return_list
 
-    def _get_scans_of_interest(self) -> List[DataScan]:
+    def _list_data_scans(self) -> List[dict]:
+        """ all scans in the dataset location, following nextPageToken """
         scan_url = self.DATAPLEX_LIST_SCANS_URL.format(
             base_url=self.DATAPLEX_BASE_URL,
             project_id=self.project_id,
             location=self.dataset_location
         )
 
-        try:
-            # print("\nSCAN URL: "+ scan_url + " \n")
-
-            response = self.get_url_content(scan_url)
-
-            #####
-            # print(response)
-            #####
+        data_scans = []
+        page_token = None
+        while True:
+            page_url = scan_url
+            if page_token:
+                page_url += f"{'&' if '?' in page_url else '?'}pageToken={page_token}"
 
+            if self._field_masks_enabled:
+                masked_url = field_masks.with_fields(page_url, field_masks.LIST_SCANS_FIELDS)
+                try:
+                    page = self._list_data_scan_page(masked_url)
+                except APIRequestError as e:
+                    if e.status_code != 400:
+                        raise e
+                    # a 400 that the unmasked request repeats is not about the mask, and is raised here
+                    page = self._list_data_scan_page(page_url)
+                    self._reject_field_masks(masked_url, e)
+            else:
+                page = self._list_data_scan_page(page_url)
+
+            data_scans.extend(page.get('dataScans', []))
+            page_token = page.get('nextPageToken')
+            if not page_token:
+                return data_scans
+
+    def _list_data_scan_page(self, page_url: str) -> dict:
+        try:
+            with self.instrumentation.span(PHASE_LIST_SCANS, url=page_url):
+                response = self.get_url_content(page_url)
         except Exception as e:
             print(f"Error fetching data scans: {e}")
             raise e
 
         try:
-            scans = json.loads(response)
+            return json.loads(response)
         except json.JSONDecodeError as e:
             print(f"Error decoding JSON response: {e}")
             raise e
 
+    @property
+    def _field_masks_enabled(self) -> bool:
+        return self.__outputs is not None and self.DATAPLEX_BASE_URL not in self._field_masks_rejected
+
+    def _reject_field_masks(self, url: str, error: APIRequestError):
+        """ called once the unmasked retry of url succeeded, so the 400 was about the mask """
+        print(f"Field mask rejected for {url}, using full responses from {self.DATAPLEX_BASE_URL} from now on: {error}")
+        with self._scan_indexes_lock:
+            self._field_masks_rejected.add(self.DATAPLEX_BASE_URL)
+
+    @classmethod
+    def clear_field_mask_rejections(cls):
+        """ forget which Dataplex endpoints rejected field masks; later requests try masks again """
+        with cls._scan_indexes_lock:
+            cls._field_masks_rejected.clear()
+
+    @property
+    def _scan_index_key(self) -> Tuple[str, str, str]:
+        return (self.DATAPLEX_LIST_SCANS_URL, self.project_id, self.dataset_location)
+
+    def _index_data_scans(self, data_scans: List[dict]) -> Dict[str, dict]:
+        """ cache the DATA_DOCUMENTATION scans of a listing by resource, latest job wins """
+        index = {}
+        for scan in data_scans:
+            resource = (scan.get('data') or {}).get('resource')
+            if not resource or scan.get('type') != ScanTypeValue.DATA_DOCUMENTATION.value:
+                continue
+
+            current = index.get(resource)
+            if current is None or _job_end_time(scan) > _job_end_time(current):
+                index[resource] = scan
+
+        with self._scan_indexes_lock:
+            self._scan_indexes[self._scan_index_key] = (time.monotonic(), index)
+
+        return index
+
+    @classmethod
+    def clear_scan_indexes(cls):
+        """ drop the scan indexes shared by all helpers; the next lookup of each location relists it """
+        with cls._scan_indexes_lock:
+            cls._scan_indexes.clear()
+            cls._scan_index_listing_locks.clear()
+
+    def _cached_scan_index(self, refresh: bool, max_age: Optional[float]) -> Optional[Dict[str, dict]]:
+        """ the shared index if still usable: younger than max_age when refreshing, else the TTL """
+        if refresh and max_age is None:
+            return None
+
+        with self._scan_indexes_lock:
+            built_at, index = self._scan_indexes.get(self._scan_index_key, (None, None))
+
+        limit = max_age if refresh else constants.SCAN_INDEX_TTL_SECONDS
+        if built_at is None or time.monotonic() - built_at > limit:
+            return None
+
+        return index
+
+    def _scan_index(self, refresh: bool = False, max_age: Optional[float] = None) -> Tuple[Dict[str, dict], bool]:
+        """
+        the location's scan index and whether it was (re)built by this call.
+        refresh relists the location unless the index is younger than max_age seconds.
+        """
+        index = self._cached_scan_index(refresh, max_age)
+        if index is None:
+            with self._scan_indexes_lock:
+                listing_lock = self._scan_index_listing_locks.setdefault(self._scan_index_key, threading.Lock())
+
+            with listing_lock:
+                # another helper for the same location may have listed it while this one waited
+                index = self._cached_scan_index(refresh, max_age)
+                if index is None:
+                    self.instrumentation.cache('scan_index', hit=False)
+                    return self._index_data_scans(self._list_data_scans()), True
+
+        self.instrumentation.cache('scan_index', hit=True)
+        return index, False
+
+    def latest_scan_end_time(self, refresh: bool = True, max_age: Optional[float] = None) -> str:
+        """
+        Newest executionStatus.latestJobEndTime across the dataset's DATA_DOCUMENTATION
+        scans ('' when there are none), compared as timestamps. refresh=True relists
+        the location, or reuses a listing younger than max_age seconds so datasets in
+        one location share it; False reuses the cached scan index. A change means new
+        documentation is available.
+        """
+        index, _ = self._scan_index(refresh=refresh, max_age=max_age)
+        dataset_resource = (
+            f"{constants.BIGQUERY_RESOURCE_PREFIX}/projects/{self.project_id}/datasets/{self.dataset_name}"
+        )
+
+        latest = max(
+            (
+                scan for resource, scan in index.items()
+                if resource == dataset_resource or resource.startswith(f"{dataset_resource}/tables/")
+            ),
+            key=_job_end_time,
+            default=None
+        )
+
+        return (latest.get('executionStatus') or {}).get('latestJobEndTime', '') if latest else ''
+
+    def _get_scans_of_interest(self) -> List[DataScan]:
+        data_scans = self._list_data_scans()
+        self._index_data_scans(data_scans)
+
         # Get the list of tables actually in the dataset at runtime (the KE API returns old stuff too)
-        dataset_table_names = self._get_dataset_table_names()
+        dataset_table_names = set(self._get_dataset_table_names())
 
         # Limit the scans to items in the requested dataset (per constructor)
         ds_test_string = f"/datasets/{self.dataset_name}"
         table_test_string = f"{ds_test_string}/tables/"
 
         scans_of_interest = []
-        for scan in scans.get('dataScans', []):
+        for scan in data_scans:
             ## note: and scan.get('type') eliminates items without type
 
             if (  
@@ -156,8 +399,16 @@ class KEDatasetScanHelper(KEAuth):
 
                 if resource.endswith(ds_test_string) or table_test_string in resource:
 
+                    # skip unwanted and dropped tables before paying for validation
+                    if table_test_string in resource and (
+                        not self._table_is_allowed(resource)
+                        or resource.split('/')[-1] not in dataset_table_names
+                    ):
+                        continue
+
                     try:
-                      new_scan = DataScan(**scan)
+                      with self.instrumentation.span(PHASE_VALIDATE, model='DataScan'):
+                          new_scan = DataScan(**scan)
                     except ValidationError as e:
                       print(f"Error creating DataScan object for {json.dumps(scan, indent=2)}:\n {e}")
                       raise e
@@ -197,19 +448,34 @@ class KEDatasetScanHelper(KEAuth):
 
     ## Options ##
     def with_table_list_constraints(self, allowlist: list = [], blocklist: list = []):
-        """ configuration option """
+        """
+        configuration option - entries are exact short table names, globs (events_2024*)
+        or regular expressions (^tmp_, re:.*_backup$ or a compiled re.Pattern). The selection
+        is applied before scans are validated or fetched and pushed into the BigQuery metadata
+        queries, including batch enrichment queries.
+        """
         overlap = list(set(allowlist).intersection(set(blocklist)))
         if overlap:
             raise ValueError(f"Allowlist and blocklist cannot contain the same items: {overlap}")
 
+        try:
+            table_selector = KETableSelector(allowlist, blocklist)
+        except re.error as e:
+            print(f"Invalid table pattern in allowlist or blocklist: {e}")
+            raise e
+
         self._flush()
-        self.__allowlist_tables.clear()
-        self.__blocklist_tables.clear()
-        self.__allowlist_tables.update(allowlist)
-        self.__blocklist_tables.update(blocklist)
+        self.__table_selector = table_selector
+        if self.__batch_enrichment is not None:
+            self.__batch_enrichment.register(self.dataset_name, table_selector)
 
         return self
 
+    @property
+    def table_selector(self) -> KETableSelector:
+        """ the table selection set by with_table_list_constraints """
+        return self.__table_selector
+
     def with_table_ddls(self, with_ddls=True):
         """ configuration option """
         self.__with_ddls = with_ddls
@@ -224,102 +490,249 @@ class KEDatasetScanHelper(KEAuth):
 
         return self
 
+    def with_cassette(self, cassette: KECassette):
+        """ configuration option - record to / replay from a KECassette (None to disable) """
+        self.__cassette = cassette
+        self.__cassette_bq_client = None
+        self._flush()
+
+        return self
+
+    def with_outputs(self, outputs: list = None):
+        """
+        configuration option - fetch only what the listed outputs need (see constants.ALL_OUTPUTS)
+        through partial responses. Outputs left out come back empty. None fetches the full view.
+        """
+        if outputs is not None:
+            unknown = set(outputs) - set(constants.ALL_OUTPUTS)
+            if unknown:
+                raise ValueError(f"Unknown outputs: {sorted(unknown)}. Valid outputs: {constants.ALL_OUTPUTS}")
+            outputs = frozenset(outputs)
+
+        self.__outputs = outputs
+        self._flush()
+
+        return self
+
+    def with_batch_enrichment(self, batch: KEBatchEnrichment):
+        """
+        configuration option - read DDLs and table counts from a KEBatchEnrichment shared
+        with the other datasets of the project and region (None for per-dataset queries)
+        """
+        if batch is not None:
+            if batch.project_id != self.project_id or batch.location.lower() != self.dataset_location.lower():
+                raise ValueError(
+                    f"Batch enrichment for {batch.project_id} in {batch.location} cannot serve "
+                    f"{self.project_id}.{self.dataset_name} in {self.dataset_location}"
+                )
+            batch.register(self.dataset_name, self.__table_selector)
+
+        self.__batch_enrichment = batch
+        self._flush()
+
+        return self
+
+    def with_build_cache(self, build_cache: KEBuildCache):
+        """
+        configuration option - reuse tables from a KEBuildCache when their scan (uid,
+        updateTime, latest job) and enrichment are unchanged; such scans are not fetched
+        again and are left out of dataplex_scans. None disables.
+        """
+        self.__build_cache = build_cache
+        self._flush()
+
+        return self
+
+    @staticmethod
+    def _table_name_job_config(table_name: str):
+        from google.cloud import bigquery
+        return bigquery.QueryJobConfig(query_parameters=[
+            bigquery.ScalarQueryParameter("table_name", "STRING", table_name)
+        ])
+
+    def _filter_tables_query(self, query: str, column: str, table_name: str = None):
+        """ restrict a metadata query to a single table, or to the selected tables """
+        if table_name:
+            return query + f"WHERE {column} = @table_name", self._table_name_job_config(table_name)
+
+        if not self.__table_selector.is_restricted:
+            return query, None
+
+        from google.cloud import bigquery
+        condition, parameters = self.__table_selector.sql_filter(column)
+        return query + f"WHERE {condition}", bigquery.QueryJobConfig(query_parameters=parameters)
+
+    def _query_table_counts(self, table_name: str = None) -> dict:
+        """ row count and size_bytes per fq table name, for the dataset or a single table """
+        client = self._bq_client
+        query = f"""
+            SELECT
+                CONCAT(project_id,'.',dataset_id,'.',table_id) AS fq_table_name
+            , row_count
+            , size_bytes
+            FROM `{self.project_id}.{self.dataset_name}.__TABLES__`
+        """
+        query, job_config = self._filter_tables_query(query, 'table_id', table_name)
+
+        with self.instrumentation.span(PHASE_BIGQUERY_QUERY, query='table_counts'):
+            query_job = client.query(query, job_config=job_config)
+            results = query_job.result()
+
+        table_counts = {}
+        for row in results:
+            table_counts[row.fq_table_name] = {
+                "row_count": row.row_count,
+                "size_bytes": row.size_bytes
+            }
+
+        return table_counts
+
+    def _query_table_ddls(self, table_name: str = None) -> dict:
+        """ DDL per fq table name, for the dataset or a single table """
+        client = self._bq_client
+        query = f"""
+            SELECT
+                CONCAT(
+                    table_catalog,'.',table_schema,'.',table_name) AS fq_table_name,
+                ddl
+            FROM `{self.project_id}.{self.dataset_name}.INFORMATION_SCHEMA.TABLES`
+        """
+        query, job_config = self._filter_tables_query(query, 'table_name', table_name)
+
+        with self.instrumentation.span(PHASE_BIGQUERY_QUERY, query='table_ddls'):
+            query_job = client.query(query, job_config=job_config)
+            results = query_job.result()
+
+        return {row.fq_table_name: row.ddl for row in results}
+
     ## Accessors ##
     @property
     def table_counts(self) -> dict:
         """ gets all the table counts for the dataset - row count, size_bytes"""
+        self.instrumentation.cache('table_counts', hit=bool(self.__table_counts))
         if not self.__table_counts:
-            client = bigquery.Client(project=self.project_id)
-            query = f"""
-                SELECT
-                    CONCAT(project_id,'.',dataset_id,'.',table_id) AS fq_table_name
-                , row_count
-                , size_bytes
-                FROM `{self.project_id}.{self.dataset_name}.__TABLES__`
-            """
-            query_job = client.query(query)
-            results = query_job.result()
-
-            for row in results:
-                self.__table_counts[row.fq_table_name] = {
-                    "row_count": row.row_count,
-                    "size_bytes": row.size_bytes
-                }
+            if self.__batch_enrichment:
+                self.__table_counts.update(self.__batch_enrichment.table_counts(self))
+            else:
+                self.__table_counts.update(self._query_table_counts())
 
         return self.__table_counts
 
     @property
     def table_ddls(self) -> dict:
         """ gets all the table DDLs for the dataset """
+        self.instrumentation.cache('table_ddls', hit=bool(self.__ddls))
         if not self.__ddls:
-          client = bigquery.Client(project=self.project_id)
-          query = f"""
-              SELECT
-                  CONCAT(
-                      table_catalog,'.',table_schema,'.',table_name) AS fq_table_name,
-                  ddl
-              FROM `{self.project_id}.{self.dataset_name}.INFORMATION_SCHEMA.TABLES`
-          """
-          query_job = client.query(query)
-          results = query_job.result()
-
-          for row in results:
-              self.__ddls[row.fq_table_name] = row.ddl
+            if self.__batch_enrichment:
+                self.__ddls.update(self.__batch_enrichment.table_ddls(self))
+            else:
+                self.__ddls.update(self._query_table_ddls())
 
         return self.__ddls
 
     @property
     def dataset_location(self) -> str:
+        self.instrumentation.cache('dataset_location', hit=bool(self.__dataset_location))
         if not self.__dataset_location:
-            client = bigquery.Client()
-            dataset = client.get_dataset(f'{self.project_id}.{self.dataset_name}')
+            client = self._bq_client
+            with self.instrumentation.span(PHASE_DATASET_LOCATION):
+                dataset = client.get_dataset(f'{self.project_id}.{self.dataset_name}')
             self.__dataset_location = dataset.location
 
         return self.__dataset_location
 
-    @property
-    def dataplex_scans(self) -> list:
-        if not self.__data_scans:
-            scans = self._get_scans_of_interest()
+    def _fetch_scan_json(self, url: str) -> dict:
+        try:
+            with self.instrumentation.span(PHASE_FETCH_SCAN, url=url):
+                response = self.get_url_content(url)
+        except Exception as e:
+            print(f"Error fetching data scans: {e}")
+            raise e
 
-            for scan in scans:
-                full_scan_url = f"{self.DATAPLEX_BASE_URL}/{scan.name}?view=FULL"
+        try:
+            return json.loads(response)
+        except json.JSONDecodeError as e:
+            print(f"Error decoding JSON response: {e}")
+            raise e
 
-                try:
-                    response = self.get_url_content(full_scan_url)
-                except Exception as e:
-                    print(f"Error fetching data scans: {e}")
-                    raise e
+    def _validate_dd_scan(self, scan: DataScan, full_view_scan: dict):
+        if scan.is_for_table:
+            with self.instrumentation.span(PHASE_VALIDATE, model='DDTableScan'):
+                return DDTableScan(**full_view_scan)
 
-                try:
-                    full_view_scan = json.loads(response)
-                except json.JSONDecodeError as e:
-                    print(f"Error decoding JSON response: {e}")
+        if scan.is_for_dataset:
+            with self.instrumentation.span(PHASE_VALIDATE, model='DDDatasetScan'):
+                return DDDatasetScan(**full_view_scan)
+
+        return None
+
+    def _scan_fields(self, scan: DataScan) -> str:
+        """ field mask covering the configured outputs, or None for the whole FULL view """
+        if not self._field_masks_enabled:
+            return None
+
+        if scan.is_for_table:
+            return field_masks.table_scan_fields(self.__outputs)
+
+        return field_masks.dataset_scan_fields(self.__outputs)
+
+    def _fetch_dd_scan(self, scan: DataScan):
+        full_scan_url = f"{self.DATAPLEX_BASE_URL}/{scan.name}?view=FULL"
+
+        fields = self._scan_fields(scan)
+        mask_error = None
+        if fields:
+            try:
+                partial_scan = self._fetch_scan_json(field_masks.with_fields(full_scan_url, fields))
+                partial_scan = field_masks.fill_omitted(partial_scan, self.__outputs, scan.is_for_table)
+                return self._validate_dd_scan(scan, partial_scan)
+            except APIRequestError as e:
+                if e.status_code != 400:
                     raise e
+                mask_error = e
+            except ValidationError as e:
+                print(f"Partial response for {scan.name} is incomplete, falling back to the full view: {e}")
+
+        full_view_scan = self._fetch_scan_json(full_scan_url)
+        if mask_error is not None: # the full view worked, so the 400 was about the mask
+            self._reject_field_masks(scan.name, mask_error)
+
+        try:
+            return self._validate_dd_scan(scan, full_view_scan)
+        except ValidationError as e:
+            if not scan.is_for_dataset:
+                raise e
+
+            print(
+                f"""Error creating a detailed Data Documentation Dataset Scan object for {scan.name}:\n {e}\n\n
+                    This may be because project {self.project_id} has not been allowlisted for dataset level Data Insights Scans.
+                """
+            )
+            return None
+
+    @property
+    def dataplex_scans(self) -> list:
+        listed = bool(self.__data_scans or self.__table_scans)
+        self.instrumentation.cache('dataplex_scans', hit=listed)
+        if not listed:
+            scans = self._get_scans_of_interest()
 
+            for scan in scans:
                 new_scan = None
 
                 # if scan.type == ScanTypeValue.KNOWLEDGE_ENGINE.value: ## !! Deprecated
                 #     new_scan = KEScan(**full_view_scan)
 
                 if scan.type == ScanTypeValue.DATA_DOCUMENTATION:
-
-                    if scan.is_for_table:
-                        new_scan = DDTableScan(**full_view_scan)
-
-                    try:
-                        if scan.is_for_dataset:
-                            new_scan = DDDatasetScan(**full_view_scan)
-                    except ValidationError as e:
-                        print(
-                            f"""Error creating a detailed Data Documentation Dataset Scan object for {json.dumps(scan, indent=2)}:\n {e}\n\n
-                                This may be because project {self.self.project_id} has not been allowlisted for dataset level Data Insights Scans.
-                            """
-                        )
-                        
+                    if self._is_cached_scan(scan):
+                        self.__table_scans.append(scan) # not fetched; dataset_tables builds it from the cache
+                        continue
+                    new_scan = self._fetch_dd_scan(scan)
 
                 if new_scan:
                   self.__data_scans.append(new_scan)
+                  if isinstance(new_scan, DDTableScan):
+                      self.__table_scans.append(new_scan)
 
         return self.__data_scans
 
@@ -346,58 +759,185 @@ class KEDatasetScanHelper(KEAuth):
     def dataset_description(self) -> str:
         return self.dataset_dd_scan.dataset_description
 
+    @staticmethod
+    def _full_table_name(table_resource_fqn: str) -> str:
+        parts = table_resource_fqn.split('/')
+        return f"{parts[constants.FQN_PROJECT_ID_INDEX]}.{parts[constants.FQN_DATASET_ID_INDEX]}.{parts[constants.FQN_TABLE_ID_INDEX]}"
+
+    def _scan_fingerprint(self, scan) -> str:
+        """ what a table built from `scan` depends on upstream: the scan version and the requested outputs """
+        return fingerprint(
+            str(scan.uid).encode(),
+            scan.update_time.isoformat().encode(),
+            scan.execution_status.latest_job_end_time.isoformat().encode(),
+            canonical(sorted(self.__outputs) if self.__outputs is not None else None),
+        )
+
+    def _is_cached_scan(self, scan: DataScan) -> bool:
+        if self.__build_cache is None or not scan.is_for_table:
+            return False
+
+        cached = self.__build_cache.get(self._full_table_name(scan.resource_name))
+        return cached is not None and cached.scan_fingerprint == self._scan_fingerprint(scan)
+
+    def _table_enrichment(
+        self,
+        full_table_name: str,
+        table_ddls: dict = None,
+        table_counts: dict = None
+    ) -> dict:
+        """ table_ddls and table_counts default to the dataset wide lookups """
+        ddl = None
+        partition_columns = None
+        cluster_columns = None
+        if self.__with_ddls:
+            table_ddls = self.table_ddls if table_ddls is None else table_ddls
+            ddl = table_ddls.get(full_table_name, None)
+            if ddl:
+                partition_columns = self._get_bq_ddl_optimizations(
+                    ddl=ddl
+                )
+                cluster_columns = self._get_bq_ddl_optimizations(
+                    ddl=ddl, optimization_type='CLUSTER'
+                )
+
+        row_count = None
+        size_bytes = None
+        if self.__with_table_counts:
+            table_counts = self.table_counts if table_counts is None else table_counts
+            counts = table_counts.get(full_table_name, None)
+            if counts:
+              row_count = counts.get("row_count")
+              size_bytes = counts.get("size_bytes")
+
+        return {
+            "ddl": ddl,
+            "row_count": row_count,
+            "size_bytes": size_bytes,
+            "partition_columns": partition_columns,
+            "cluster_columns": cluster_columns,
+        }
+
+    def _build_table(
+        self,
+        scan,
+        table_ddls: dict = None,
+        table_counts: dict = None
+    ) -> KEDatasetTable:
+        """
+        scan is a DDTableScan, or the listing DataScan of a table in the build cache.
+        table_ddls and table_counts default to the dataset wide lookups.
+        """
+        full_table_name = self._full_table_name(scan.resource_name)
+        enrichment = self._table_enrichment(full_table_name, table_ddls, table_counts)
+
+        if self.__build_cache is None:
+            return self._new_table(scan, enrichment)
+
+        scan_fingerprint = self._scan_fingerprint(scan)
+        enrichment_fingerprint = fingerprint(canonical(enrichment))
+        cached = self.__build_cache.get(full_table_name)
+
+        if cached is not None and cached.scan_fingerprint == scan_fingerprint:
+            self.instrumentation.cache('table_build', hit=cached.enrichment_fingerprint == enrichment_fingerprint)
+            if cached.enrichment_fingerprint == enrichment_fingerprint:
+                return cached.table
+            table = cached.table.model_copy(update=enrichment) # only the BigQuery metadata moved
+        else:
+            self.instrumentation.cache('table_build', hit=False)
+            if not isinstance(scan, DDTableScan): # evicted since dataplex_scans checked it
+                scan = self._fetch_dd_scan(scan)
+            table = self._new_table(scan, enrichment)
+
+        self.__build_cache.put(full_table_name, scan_fingerprint, enrichment_fingerprint, table)
+        return table
+
+    @staticmethod
+    def _new_table(scan: DDTableScan, enrichment: dict) -> KEDatasetTable:
+        return KEDatasetTable(**{
+            "name": scan.full_table_name,
+            "overview": scan.overview,
+            "fields": scan.fields,
+            "queries": scan.queries,
+            **enrichment,
+        })
+
     @property
     def dataset_tables(self) -> List[KEDatasetTable]:
 
         tables = []
+        self.dataplex_scans # lists and fetches the scans, filling __table_scans
+        # fetched DDTableScans and, for build cache hits, listing DataScans, in listing order
+        scans = self.__table_scans
 
-        for scan in self.dataplex_scans:
+        with self.instrumentation.span(PHASE_BUILD_TABLES):
+            for scan in scans:
+                if scan.is_for_table:
+                    if self._table_is_allowed(scan.resource_name): # This is already filtered
+                        tables.append(self._build_table(scan))
 
-            if isinstance(scan, DDTableScan):
-
-                if self._table_is_allowed(scan.resource_name): # This is already filtered
-
-                    ddl = None
-                    partition_columns = None
-                    cluster_columns = None
-                    if self.__with_ddls:
-                        ddl = self.table_ddls.get(scan.full_table_name, None)
-                        partition_columns = self._get_bq_ddl_optimizations(
-                            ddl=ddl
-                        )
-                        cluster_columns = self._get_bq_ddl_optimizations(
-                            ddl=ddl, optimization_type='CLUSTER'
-                        )
-
-                    row_count = None
-                    size_bytes = None
-                    if self.__with_table_counts:
-                        table_counts = self.table_counts.get(scan.full_table_name, None)
-                        if table_counts:
-                          row_count = table_counts.get("row_count")
-                          size_bytes = table_counts.get("size_bytes")
-
-
-                    # print(type(scan.fields))
-                    # print(type(scan.fields[0]))
-                    # print(SchemaField(**scan.fields[0].model_dump()))
-                    # print(type(scan.queries))
-                    # print(type(scan.queries[0]))
-
-                    tables.append(KEDatasetTable(**{
-                        "name": scan.full_table_name,
-                        "overview": scan.overview,
-                        "fields": scan.fields,
-                        "queries": scan.queries,
-                        "ddl": ddl,
-                        "row_count": row_count,
-                        "size_bytes": size_bytes,
-                        "partition_columns": partition_columns,
-                        "cluster_columns": cluster_columns,
-                    }))
+        if self.__build_cache is not None:
+            self.__build_cache.retain(
+                (table.name for table in tables), prefix=f"{self.project_id}.{self.dataset_name}."
+            )
 
         return tables
 
+    def table_documentation(self, table_name: str) -> KEDatasetTable:
+        """
+        Point lookup of a single table (short name): finds its scan through the cached
+        location scan index, fetches only that scan and enriches only that table.
+        Tables excluded by the table list constraints or no longer in BigQuery
+        (Dataplex keeps scans of dropped tables) raise NoDDScanFoundException.
+        """
+        fq_table_name = f"{self.project_id}.{self.dataset_name}.{table_name}"
+        resource = (
+            f"{constants.BIGQUERY_RESOURCE_PREFIX}/projects/{self.project_id}"
+            f"/datasets/{self.dataset_name}/tables/{table_name}"
+        )
+        if not self._table_is_allowed(resource):
+            raise NoDDScanFoundException(f"Table {fq_table_name} is excluded by the table list constraints.")
+
+        index, fresh = self._scan_index()
+        if resource not in index and not fresh: # the scan may be newer than the index
+            index, _ = self._scan_index(refresh=True)
+        if resource not in index:
+            raise NoDDScanFoundException(
+                f"No Data Documentation scan found for table {self.project_id}.{self.dataset_name}.{table_name}."
+            )
+
+        # the DDL query doubles as the existence check; without it, ask for the table
+        table_ddls = self._query_table_ddls(table_name) if self.__with_ddls else None
+        exists = bool(table_ddls) if self.__with_ddls else self._table_exists(table_name)
+        if not exists:
+            raise NoDDScanFoundException(
+                f"Table {fq_table_name} no longer exists in BigQuery; its Data Documentation scan is stale."
+            )
+
+        with self.instrumentation.span(PHASE_VALIDATE, model='DataScan'):
+            scan = DataScan(**index[resource])
+
+        dd_scan = self._fetch_dd_scan(scan)
+
+        with self.instrumentation.span(PHASE_BUILD_TABLES):
+            return self._build_table(
+                dd_scan,
+                table_ddls=table_ddls,
+                table_counts=self._query_table_counts(table_name) if self.__with_table_counts else None
+            )
+
+    def _table_exists(self, table_name: str) -> bool:
+        from google.api_core.exceptions import NotFound
+
+        table_ref = f"{self.project_id}.{self.dataset_name}.{table_name}"
+        with self.instrumentation.span(PHASE_LIST_TABLES, table=table_ref):
+            try:
+                self._bq_client.get_table(table_ref)
+            except NotFound:
+                return False
+
+        return True
+
     @property
     def dataset_queries(self) -> List[Query]:
         return self.dataset_dd_scan.queries
@@ -417,52 +957,59 @@ class KEDatasetScanHelper(KEAuth):
 
         return_relationships = []
 
-        relationships = self.dataset_dd_scan.schema_relationships
-        for relationship in relationships:
-
-          l_schema_paths = relationship.left_schema_paths
-          l_table_fqn = l_schema_paths.table_fqn
-          l_table_paths = l_schema_paths.paths
-          l_table_sql_name = f"{project_dataset}.{l_table_fqn.split('/')[-1]}"
-          if not self._table_is_allowed(l_table_fqn):
-              continue
-
-          r_schema_paths = relationship.right_schema_paths
-          r_table_fqn = r_schema_paths.table_fqn
-          r_table_paths = r_schema_paths.paths
-          r_table_sql_name = f"{project_dataset}.{r_table_fqn.split('/')[-1]}"
-          if not self._table_is_allowed(r_table_fqn):
-              continue
-
-          join_conditions = []
-
-          for i, l_table_path in enumerate(l_table_paths):
-              r_table_path = r_table_paths[i]
-              new_join_condition = l_table_sql_name + '.' + l_table_path
-              new_join_condition += ' = '
-              new_join_condition += r_table_sql_name + '.' + r_table_path
-              join_conditions.append(new_join_condition)
-
-          return_relationships.append(KEDatasetRelationship(**{
-              'table1': l_table_sql_name,
-              'table2': r_table_sql_name,
-              'relationship': ' AND '.join(join_conditions),
-              'sources': relationship.sources,
-              'confidence_score': relationship.confidence_score,
-              'type': relationship.type,
-          }))
+        relationships = self.dataset_dd_scan.schema_relationships or []
+        with self.instrumentation.span(PHASE_BUILD_RELATIONSHIPS):
+            for relationship in relationships:
+
+              l_schema_paths = relationship.left_schema_paths
+              l_table_fqn = l_schema_paths.table_fqn
+              l_table_paths = l_schema_paths.paths
+              l_table_sql_name = f"{project_dataset}.{l_table_fqn.split('/')[-1]}"
+              if not self._table_is_allowed(l_table_fqn):
+                  continue
+
+              r_schema_paths = relationship.right_schema_paths
+              r_table_fqn = r_schema_paths.table_fqn
+              r_table_paths = r_schema_paths.paths
+              r_table_sql_name = f"{project_dataset}.{r_table_fqn.split('/')[-1]}"
+              if not self._table_is_allowed(r_table_fqn):
+                  continue
+
+              join_conditions = []
+
+              for i, l_table_path in enumerate(l_table_paths):
+                  r_table_path = r_table_paths[i]
+                  new_join_condition = l_table_sql_name + '.' + l_table_path
+                  new_join_condition += ' = '
+                  new_join_condition += r_table_sql_name + '.' + r_table_path
+                  join_conditions.append(new_join_condition)
+
+              return_relationships.append(KEDatasetRelationship(**{
+                  'table1': l_table_sql_name,
+                  'table2': r_table_sql_name,
+                  'relationship': ' AND '.join(join_conditions),
+                  'sources': relationship.sources,
+                  'confidence_score': relationship.confidence_score,
+                  'type': relationship.type,
+              }))
 
         return return_relationships
 
     @property
     def dataset_all_details(self) -> KEDatasetDetails:
-        return KEDatasetDetails(**{
-            "project_id": self.project_id,
-            "dataset_name": self.dataset_name,
-            "dataset_location": self.dataset_location,
-            "dataset_description": self.dataset_description,
-            "dataset_relationships": self.dataset_relationships,
-            "dataset_queries": self.dataset_queries,
-            # "dataset_business_glossary": self.dataset_business_glossary, # deprecated
-            "dataset_tables": self.dataset_tables
-        })
+        with self.instrumentation.span(PHASE_DATASET_ALL_DETAILS, dataset=f"{self.project_id}.{self.dataset_name}"):
+            return KEDatasetDetails(**{
+                "project_id": self.project_id,
+                "dataset_name": self.dataset_name,
+                "dataset_location": self.dataset_location,
+                "dataset_description": self.dataset_description,
+                "dataset_relationships": self.dataset_relationships,
+                "dataset_queries": self.dataset_queries,
+                # "dataset_business_glossary": self.dataset_business_glossary, # deprecated
+                "dataset_tables": self.dataset_tables
+            })
+
+    @property
+    def metrics(self) -> KEMetricsReport:
+        """ running per-phase timings, HTTP, retry, cache and BigQuery totals for this helper """
+        return self.instrumentation.report
@@ -3,16 +3,58 @@
   Classes for output from KEDatasetScanHelper
   ------------------------------------------
 """
-import json
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 
 from .common_models import Schema, SchemaField, Query
+from ..serialization import canonical, encode_field, fingerprint
 
 
 
-class KEDatasetTable(BaseModel):
+class _OutputModel(BaseModel):
+    """
+    Output models are immutable, so encoded JSON subtrees can be cached per instance
+    and the content fingerprint is computed once, at construction.
+
+    Frozen only blocks attribute assignment: list fields can still be mutated in
+    place (table.fields.append(...)), which leaves the cached *_json and the
+    fingerprint stale. Derive changed models with model_copy(update=...) instead.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    _json_cache: dict = PrivateAttr(default_factory=dict)
+    _fingerprint: Optional[str] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context):
+        self._fingerprint = self._compute_fingerprint()
+
+    def __eq__(self, other) -> bool:
+        # fields only: pydantic would also compare private attributes, and _json_cache fills on read
+        if not isinstance(other, BaseModel):
+            return NotImplemented
+        return type(self) is type(other) and self.__dict__ == other.__dict__
+
+    def model_copy(self, *, update=None, deep=False):
+        copy = super().model_copy(update=update, deep=deep)
+        copy._json_cache = {}
+        copy._fingerprint = copy._compute_fingerprint()
+        return copy
+
+    def json_bytes(self, field_name: str) -> bytes:
+        """ compact UTF-8 JSON of a single list field, encoded once """
+        return encode_field(self, field_name)
+
+    def _compute_fingerprint(self) -> str:
+        return fingerprint(canonical(self.model_dump(mode='json')))
+
+    @property
+    def fingerprint(self) -> str:
+        """ stable content hash: equal content gives equal fingerprints, across processes """
+        return self._fingerprint
+
+
+class KEDatasetTable(_OutputModel):
     """
     Represents a single table.
     """
@@ -28,13 +70,11 @@ class KEDatasetTable(BaseModel):
 
     @property
     def fields_json(self) -> str:
-        full_model = self.model_dump()
-        return json.dumps(full_model['fields'])
+        return self.json_bytes('fields').decode('utf-8')
 
     @property
     def queries_json(self) -> str:
-        full_model = self.model_dump()
-        return json.dumps(full_model['queries'])
+        return self.json_bytes('queries').decode('utf-8')
 
     @property
     def text_field_descriptions(self) -> str:
@@ -47,7 +87,7 @@ class KEDatasetTable(BaseModel):
         return field_descriptions
 
 
-class KEDatasetRelationship(BaseModel):
+class KEDatasetRelationship(_OutputModel):
     """
     Represents a single relationship between two database tables.
     """
@@ -59,7 +99,7 @@ class KEDatasetRelationship(BaseModel):
     type: str = Field(..., description="The type of relationship, such as SCHEMA_JOIN")
 
 
-class KEDatasetDetails(BaseModel):
+class KEDatasetDetails(_OutputModel):
     """
     Represents the detailed documentation results for a specific dataset.
     """
@@ -72,15 +112,31 @@ class KEDatasetDetails(BaseModel):
     # dataset_business_glossary: List[BusinessTerm] = Field(..., description="A list of business glossary terms.") # deprecated
     dataset_tables: List[KEDatasetTable] = Field(..., description="A list of tables in the dataset.")
 
+    _relationships_fingerprint: Optional[str] = PrivateAttr(default=None)
+
+    def _compute_fingerprint(self) -> str:
+        # built from the children's fingerprints instead of re-serializing them
+        self._relationships_fingerprint = fingerprint(
+            *(relationship.fingerprint.encode() for relationship in self.dataset_relationships)
+        )
+        return fingerprint(
+            canonical(self.model_dump(mode='json', exclude={'dataset_relationships', 'dataset_tables'})),
+            self._relationships_fingerprint.encode(),
+            *(table.fingerprint.encode() for table in self.dataset_tables),
+        )
+
+    @property
+    def relationships_fingerprint(self) -> str:
+        """ stable hash of dataset_relationships as a whole """
+        return self._relationships_fingerprint
+
     @property
     def dataset_relationships_json(self) -> str:
-        full_model = self.model_dump()
-        return json.dumps(full_model['dataset_relationships'])
+        return self.json_bytes('dataset_relationships').decode('utf-8')
 
     @property
     def dataset_queries_json(self) -> str:
-        full_model = self.model_dump()
-        return json.dumps(full_model['dataset_queries'])
+        return self.json_bytes('dataset_queries').decode('utf-8')
     
     # deprecated
     # property
@@ -0,0 +1,290 @@
+"""
+  ------------------------------------------
+  Background prefetch: keeps dataset_all_details warm for configured datasets
+  ------------------------------------------
+"""
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from . import constants
+from .build_cache import KEBuildCache
+from .instrumentation import KEMetricsReport
+from .ke_helper import KEDatasetScanHelper
+from .models.output_models import KEDatasetDetails
+
+
+class KEPrefetchStatus(BaseModel):
+    """ state of one prefetched dataset """
+    project_id: str
+    dataset_name: str
+    built_at: Optional[datetime] = None
+    scan_version: Optional[str] = None
+    builds: int = 0
+    in_flight: bool = False
+    last_error: Optional[str] = None
+    last_metrics: Optional[KEMetricsReport] = None
+
+
+class _PrefetchEntry:
+    def __init__(self, project_id: str, dataset_name: str, configure: Optional[Callable], helper_kwargs: dict):
+        self.project_id = project_id
+        self.dataset_name = dataset_name
+        self.configure = configure
+        self.helper_kwargs = helper_kwargs
+        self.build_cache = KEBuildCache()
+        self.details: Optional[KEDatasetDetails] = None
+        self.built_at: Optional[datetime] = None
+        self.scan_version: Optional[str] = None
+        self.builds = 0
+        self.in_flight = False
+        self.last_error: Optional[str] = None
+        self.last_metrics: Optional[KEMetricsReport] = None
+        self.next_build = 0.0
+        self.next_check = 0.0
+        self.future: Optional[Future] = None
+        self.ready = threading.Event()
+
+
+class KEPrefetchScheduler:
+    """
+    Builds the configured datasets in the background and rebuilds them every
+    refresh_seconds, or sooner when a check finds that a documentation scan of the
+    dataset has finished a new job (executionStatus.latestJobEndTime changed).
+    A check costs one scan listing of the dataset's location, shared by every
+    dataset in that location that checks within the same check_seconds.
+
+    refresh_seconds  full rebuild cadence
+    check_seconds    change check cadence (None disables checks)
+    jitter_seconds   random delay added to every scheduled rebuild and check
+    max_workers      builds and checks running at the same time
+    helper_class     KEDatasetScanHelper or a subclass
+
+    Foreground callers read the latest completed build with get(); they never
+    wait on Dataplex or BigQuery unless they ask to wait for the first build.
+    """
+
+    def __init__(
+        self,
+        refresh_seconds: float = constants.PREFETCH_REFRESH_SECONDS,
+        check_seconds: Optional[float] = constants.PREFETCH_CHECK_SECONDS,
+        jitter_seconds: float = constants.PREFETCH_JITTER_SECONDS,
+        max_workers: int = constants.PREFETCH_MAX_WORKERS,
+        helper_class: type = KEDatasetScanHelper
+    ):
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+
+        self.refresh_seconds = refresh_seconds
+        self.check_seconds = check_seconds
+        self.jitter_seconds = jitter_seconds
+        self.max_workers = max_workers
+        self.helper_class = helper_class
+
+        self._entries: Dict[Tuple[str, str], _PrefetchEntry] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    ## Configuration ##
+    def add(
+        self,
+        project_id: str,
+        dataset_name: str,
+        configure: Callable[[KEDatasetScanHelper], object] = None,
+        **helper_kwargs
+    ):
+        """
+        keep a dataset warm. configure receives each new helper to apply options,
+        e.g. lambda helper: helper.with_table_ddls().with_table_counts().
+        helper_kwargs are passed to the helper constructor.
+        """
+        entry = _PrefetchEntry(project_id, dataset_name, configure, dict(helper_kwargs))
+        entry.next_build = time.monotonic() + self._jitter() # spread the first round too
+        with self._lock:
+            self._entries[(project_id, dataset_name)] = entry
+        self._wake.set()
+
+        return self
+
+    def remove(self, project_id: str, dataset_name: str):
+        """ stop prefetching a dataset; a build already running still completes """
+        with self._lock:
+            self._entries.pop((project_id, dataset_name), None)
+
+        return self
+
+    ## Lifecycle ##
+    def start(self):
+        if self._thread is None:
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="ke-prefetch", daemon=True)
+            self._thread.start()
+
+        return self
+
+    def stop(self, wait: bool = True):
+        """ stop scheduling; wait=True also waits for running builds """
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    ## Foreground ##
+    def get(self, project_id: str, dataset_name: str, wait: float = 0) -> Optional[KEDatasetDetails]:
+        """
+        latest completed build, or None before the first one completes.
+        wait is the number of seconds to block for the first build.
+        """
+        entry = self._entry(project_id, dataset_name)
+        if wait and entry.details is None:
+            entry.ready.wait(wait)
+
+        return entry.details
+
+    def refresh(self, project_id: str, dataset_name: str) -> Future:
+        """
+        rebuild a dataset now (within the worker limit). The future resolves to
+        the new KEDatasetDetails; if a build or check is already running, to its result.
+        """
+        entry = self._entry(project_id, dataset_name)
+        with self._lock:
+            if entry.in_flight:
+                return entry.future
+            return self._submit(entry, force=True)
+
+    @property
+    def status(self) -> List[KEPrefetchStatus]:
+        with self._lock:
+            return [
+                KEPrefetchStatus(
+                    project_id=entry.project_id,
+                    dataset_name=entry.dataset_name,
+                    built_at=entry.built_at,
+                    scan_version=entry.scan_version,
+                    builds=entry.builds,
+                    in_flight=entry.in_flight,
+                    last_error=entry.last_error,
+                    last_metrics=entry.last_metrics,
+                )
+                for entry in self._entries.values()
+            ]
+
+    def _entry(self, project_id: str, dataset_name: str) -> _PrefetchEntry:
+        with self._lock:
+            entry = self._entries.get((project_id, dataset_name))
+        if entry is None:
+            raise KeyError(f"{project_id}.{dataset_name} is not configured for prefetch")
+
+        return entry
+
+    ## Scheduling ##
+    def _jitter(self) -> float:
+        return random.uniform(0, self.jitter_seconds) if self.jitter_seconds else 0.0
+
+    def _submit(self, entry: _PrefetchEntry, force: bool) -> Future:
+        """ caller holds self._lock """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ke-prefetch-build")
+
+        entry.in_flight = True
+        entry.future = self._executor.submit(self._refresh_entry, entry, force)
+        return entry.future
+
+    def _run(self):
+        while not self._stopping.is_set():
+            now = time.monotonic()
+            next_wake = now + self.refresh_seconds
+
+            with self._lock:
+                for entry in self._entries.values():
+                    if entry.in_flight:
+                        continue
+
+                    check_due = (
+                        self.check_seconds is not None
+                        and entry.details is not None
+                        and now >= entry.next_check
+                    )
+                    if now >= entry.next_build or check_due:
+                        self._submit(entry, force=now >= entry.next_build)
+                        continue
+
+                    next_wake = min(next_wake, entry.next_build)
+                    if self.check_seconds is not None and entry.details is not None:
+                        next_wake = min(next_wake, entry.next_check)
+
+            # finished builds, new entries and stop() set the event
+            self._wake.wait(max(0.0, next_wake - time.monotonic()))
+            self._wake.clear()
+
+    def _new_helper(self, entry: _PrefetchEntry) -> KEDatasetScanHelper:
+        helper = self.helper_class(entry.project_id, entry.dataset_name, **entry.helper_kwargs)
+        helper.with_build_cache(entry.build_cache) # rebuilds only refetch tables whose scans changed
+        if entry.configure is not None:
+            entry.configure(helper)
+
+        return helper
+
+    def _refresh_entry(self, entry: _PrefetchEntry, force: bool) -> Optional[KEDatasetDetails]:
+        """ runs on a worker: check for new scan jobs (unless forced) and rebuild """
+        try:
+            helper = self._new_helper(entry)
+
+            if not force:
+                # a listing another dataset of the location made this interval is recent enough
+                version = helper.latest_scan_end_time(max_age=self.check_seconds)
+                if version == entry.scan_version:
+                    with self._lock:
+                        entry.next_check = time.monotonic() + self.check_seconds + self._jitter()
+                    return entry.details
+
+            details = helper.dataset_all_details
+            # the build just indexed the location's scans, so this is not another request
+            version = helper.latest_scan_end_time(refresh=False)
+
+            now = time.monotonic()
+            with self._lock:
+                entry.details = details
+                entry.built_at = datetime.now(timezone.utc)
+                entry.scan_version = version
+                entry.builds += 1
+                entry.last_error = None
+                entry.last_metrics = helper.metrics
+                entry.helper_kwargs.setdefault('dataset_location', details.dataset_location)
+                entry.next_build = now + self.refresh_seconds + self._jitter()
+                entry.next_check = now + (self.check_seconds or 0) + self._jitter()
+            entry.ready.set()
+
+            return details
+        except Exception as e:
+            print(f"Error prefetching {entry.project_id}.{entry.dataset_name}: {e}")
+            with self._lock:
+                entry.last_error = str(e)
+                retry_seconds = self.check_seconds if self.check_seconds is not None else self.refresh_seconds
+                entry.next_build = time.monotonic() + retry_seconds + self._jitter()
+                entry.next_check = entry.next_build
+            raise e
+        finally:
+            with self._lock:
+                entry.in_flight = False
+            self._wake.set()
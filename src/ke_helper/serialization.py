@@ -0,0 +1,78 @@
+"""
+  ------------------------------------------
+  JSON encoding for output models: subtree only, cached per instance,
+  using orjson when it is installed; content fingerprints
+  ------------------------------------------
+"""
+import hashlib
+import json
+
+_backend = None
+
+
+def json_backend():
+    """ the orjson module when installed, otherwise None (stdlib json) """
+    global _backend
+    if _backend is None:
+        try:
+            import orjson
+            _backend = orjson
+        except ImportError:
+            _backend = False
+
+    return _backend or None
+
+
+def dumps(value) -> bytes:
+    """
+    Compact UTF-8 JSON. The stdlib fallback uses the same separators and leaves
+    non-ASCII text unescaped, so both backends give the same structure; float
+    spelling can still differ (orjson 0.00005 and 1e-7, stdlib 5e-05 and 1e-07).
+    Compare decoded values, not bytes, and hash canonical() instead.
+    """
+    orjson = json_backend()
+    if orjson:
+        return orjson.dumps(value)
+
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def canonical(value) -> bytes:
+    """
+    The one encoding that is hashed: stdlib JSON with sorted keys and no
+    whitespace, independent of the installed backend.
+    """
+    return json.dumps(value, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def encode_field(model, field_name: str) -> bytes:
+    """
+    Encode one list field of a model without dumping the rest of it.
+    Models exposing a `_json_cache` dict (the frozen output models) keep the result.
+    """
+    cache = getattr(model, '_json_cache', None)
+    if cache is not None and field_name in cache:
+        return cache[field_name]
+
+    value = getattr(model, field_name)
+    if value is not None:
+        value = [item.model_dump(mode='json') if hasattr(item, 'model_dump') else item for item in value]
+    encoded = dumps(value)
+
+    if cache is not None:
+        cache[field_name] = encoded
+    return encoded
+
+
+def fingerprint(*parts: bytes) -> str:
+    """
+    Stable hex digest of a sequence of encoded parts (length-prefixed, so
+    part boundaries matter). Same content, same fingerprint, in any process,
+    as long as the parts come from canonical().
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(len(part).to_bytes(8, 'big'))
+        digest.update(part)
+
+    return digest.hexdigest()
@@ -0,0 +1,167 @@
+"""
+  ------------------------------------------
+  Table selection for allowlists and blocklists: exact names, globs and
+  regular expressions compiled into one matcher per list, usable in Python
+  and as a BigQuery WHERE clause
+  ------------------------------------------
+"""
+import re
+from typing import Iterable, List, Optional, Pattern, Set, Tuple, Union
+
+GLOB_CHARACTERS = "*?["
+# not valid in BigQuery table names and meaningless in globs: only a regex would use them
+REGEX_CHARACTERS = ".+(){}|\\$^"
+REGEX_PREFIX = "re:"
+
+# re flags with an RE2 equivalent, as inline flag letters; re.UNICODE is the default for str patterns
+RE2_FLAGS = {re.IGNORECASE: "i", re.MULTILINE: "m", re.DOTALL: "s"}
+_LEADING_INLINE_FLAGS = re.compile(r"^\(\?([a-zA-Z]+)\)")
+
+Selector = Union[str, Pattern]
+
+
+def is_regex(selector: Selector) -> bool:
+    """ compiled patterns and strings starting with re: or ^ """
+    return not isinstance(selector, str) or selector.startswith((REGEX_PREFIX, "^"))
+
+
+def is_pattern(selector: Selector) -> bool:
+    """
+    regular expressions (see is_regex) and globs (strings with * ? or [). BigQuery
+    table names contain none of these, so anything else is an exact name. Other
+    strings using regex syntax are ambiguous and raise ValueError.
+    """
+    if is_regex(selector):
+        return True
+
+    regex_characters = sorted({c for c in selector if c in REGEX_CHARACTERS})
+    if regex_characters:
+        raise ValueError(
+            f"Table selector {selector!r} is neither a table name nor a glob (it uses {''.join(regex_characters)}). "
+            f"Write regular expressions as {REGEX_PREFIX}{selector}, ^..., or a compiled re.Pattern."
+        )
+
+    return any(c in selector for c in GLOB_CHARACTERS)
+
+
+def glob_to_regex(glob: str) -> str:
+    """ anchored regex for a glob, using syntax shared by Python re and BigQuery's RE2 """
+    regex, i = "", 0
+    while i < len(glob):
+        char = glob[i]
+        if char == "*":
+            regex += ".*"
+        elif char == "?":
+            regex += "."
+        elif char == "[" and "]" in glob[i + 2:]:
+            end = glob.index("]", i + 2)
+            body = glob[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            regex += f"[{body}]"
+            i = end
+        else:
+            regex += re.escape(char)
+        i += 1
+
+    return f"^{regex}$"
+
+
+def _selector_regex(selector: Selector) -> str:
+    """
+    the selector as one regex valid in Python re and RE2. Flags, whether compiled
+    in or leading the pattern as (?i), become a scoped (?i:...) group so they
+    survive being combined with other selectors.
+    """
+    if not is_regex(selector):
+        return glob_to_regex(selector)
+
+    flags = ""
+    if isinstance(selector, str):
+        pattern = selector[len(REGEX_PREFIX):] if selector.startswith(REGEX_PREFIX) else selector
+    else:
+        pattern = selector.pattern
+        if not isinstance(pattern, str):
+            raise ValueError(f"Table selector {selector!r} must be a str pattern, not bytes")
+
+        unsupported = selector.flags & ~(re.UNICODE | sum(RE2_FLAGS))
+        if unsupported:
+            raise ValueError(f"Table selector {selector!r} uses {re.RegexFlag(unsupported)!r}, which RE2 lacks")
+        flags = "".join(letter for flag, letter in RE2_FLAGS.items() if selector.flags & flag)
+
+    leading = _LEADING_INLINE_FLAGS.match(pattern)
+    if leading:
+        unsupported = set(leading.group(1)) - set(RE2_FLAGS.values()) - {"u"}
+        if unsupported:
+            raise ValueError(f"Table selector {selector!r} uses inline flags {''.join(sorted(unsupported))}, which RE2 lacks")
+        flags += leading.group(1).replace("u", "")
+        pattern = pattern[leading.end():]
+
+    flags = "".join(sorted(set(flags)))
+    return f"(?{flags}:{pattern})" if flags else pattern
+
+
+class _CompiledList:
+    """ one allowlist or blocklist: a set of exact names and one combined regex """
+
+    def __init__(self, selectors: Iterable[Selector]):
+        selectors = list(selectors)
+        self.names: Set[str] = {s for s in selectors if not is_pattern(s)}
+        patterns = [_selector_regex(s) for s in selectors if is_pattern(s)]
+        self.pattern: Optional[str] = "|".join(f"(?:{p})" for p in patterns) or None
+        self._regex = re.compile(self.pattern) if self.pattern else None
+
+    def __bool__(self) -> bool:
+        return bool(self.names or self.pattern)
+
+    def matches(self, short_table_name: str) -> bool:
+        return short_table_name in self.names or bool(self._regex and self._regex.search(short_table_name))
+
+
+class KETableSelector:
+    """
+    Compiled allowlist / blocklist of short table names. Entries are exact names,
+    globs (events_2024*) or regular expressions (^tmp_, re:.*_backup$, or a compiled
+    re.Pattern; IGNORECASE, MULTILINE and DOTALL are kept). An empty allowlist allows
+    every table. Regular expressions pushed into BigQuery must also be valid RE2.
+    """
+
+    def __init__(self, allowlist: Iterable[Selector] = (), blocklist: Iterable[Selector] = ()):
+        self.allow = _CompiledList(allowlist)
+        self.block = _CompiledList(blocklist)
+
+    @property
+    def is_restricted(self) -> bool:
+        return bool(self.allow or self.block)
+
+    def allows(self, short_table_name: str) -> bool:
+        if self.allow and not self.allow.matches(short_table_name):
+            return False
+
+        return not (self.block and self.block.matches(short_table_name))
+
+    def sql_filter(self, column: str, parameter_prefix: str = "") -> Tuple[str, List]:
+        """
+        WHERE condition on `column` selecting the same tables, and its BigQuery
+        query parameters (names start with parameter_prefix); ("", []) when unrestricted.
+        """
+        from google.cloud import bigquery
+
+        conditions, parameters = [], []
+        for prefix, compiled in (("allow", self.allow), ("block", self.block)):
+            if not compiled:
+                continue
+            name = f"{parameter_prefix}{prefix}"
+
+            matches = []
+            if compiled.names:
+                matches.append(f"{column} IN UNNEST(@{name}_names)")
+                parameters.append(bigquery.ArrayQueryParameter(f"{name}_names", "STRING", sorted(compiled.names)))
+            if compiled.pattern:
+                matches.append(f"REGEXP_CONTAINS({column}, @{name}_pattern)")
+                parameters.append(bigquery.ScalarQueryParameter(f"{name}_pattern", "STRING", compiled.pattern))
+
+            condition = " OR ".join(matches)
+            conditions.append(f"({condition})" if prefix == "allow" else f"NOT ({condition})")
+
+        return " AND ".join(conditions), parameters
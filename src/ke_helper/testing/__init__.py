@@ -0,0 +1,8 @@
+"""
+  ------------------------------------------
+  Offline stand-ins for Dataplex and BigQuery, for tests and benchmarks
+  ------------------------------------------
+"""
+from .fixtures import FakeDataset
+from .fake_dataplex import FakeDataplexServer, FakeCredentials, parse_field_mask, apply_field_mask
+from .fake_bigquery import FakeBigQueryClient, FakeQueryJob
@@ -0,0 +1,152 @@
+"""
+  ------------------------------------------
+  Local stand-in for the BigQuery metadata calls made by KEDatasetScanHelper
+  ------------------------------------------
+"""
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+
+from .fixtures import FakeDataset
+
+
+class FakeQueryJob:
+    def __init__(self, rows: List[SimpleNamespace]):
+        self._rows = rows
+
+    def result(self) -> List[SimpleNamespace]:
+        return self._rows
+
+
+class FakeBigQueryClient:
+    """
+    Implements the subset of bigquery.Client used by the helper: list_tables,
+    get_table, get_dataset and metadata queries against __TABLES__ and INFORMATION_SCHEMA.TABLES,
+    honouring the @table_name and table selector (@allow_names, @allow_pattern,
+    @block_names, @block_pattern) query parameters, and region-qualified queries against
+    INFORMATION_SCHEMA.TABLES and TABLE_STORAGE, honouring the @datasets parameter and
+    the per-dataset @dsN / @dsN_allow_names ... selectors of batch enrichment.
+
+    latency  seconds slept per call (list_tables, get_dataset, query)
+    """
+    DATASET_REF_REGEX = re.compile(r"`([\w-]+)\.(\w+)\.(__TABLES__|INFORMATION_SCHEMA\.TABLES)`")
+    REGION_REF_REGEX = re.compile(r"`([\w.:-]+)\.region-([\w-]+)\.INFORMATION_SCHEMA\.(TABLES|TABLE_STORAGE)`")
+
+    def __init__(self, datasets: List[FakeDataset], latency: float = 0.0):
+        self.latency = latency
+        self._datasets: Dict[Tuple[str, str], FakeDataset] = {
+            (d.project_id, d.dataset_name): d for d in datasets
+        }
+        self._lock = threading.Lock()
+        self.request_count = 0
+        self.job_count = 0
+        self.queries: List[str] = []
+
+    def reset_counters(self):
+        with self._lock:
+            self.request_count = 0
+            self.job_count = 0
+            self.queries.clear()
+
+    def _call(self, is_job: bool = False):
+        with self._lock:
+            self.request_count += 1
+            self.job_count += int(is_job)
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _dataset(self, dataset_ref: str) -> FakeDataset:
+        project_id, dataset_name = dataset_ref.split(".")
+        return self._datasets[(project_id, dataset_name)]
+
+    def list_tables(self, dataset_ref: str) -> List[SimpleNamespace]:
+        self._call()
+        dataset = self._dataset(dataset_ref)
+        return [
+            SimpleNamespace(full_table_id=f"{dataset.project_id}:{dataset.dataset_name}.{t}")
+            for t in dataset.table_names
+        ]
+
+    def get_table(self, table_ref: str) -> SimpleNamespace:
+        from google.api_core.exceptions import NotFound
+
+        self._call()
+        project_id, dataset_name, table_name = table_ref.split(".")
+        dataset = self._datasets.get((project_id, dataset_name))
+        if dataset is None or table_name not in dataset.table_names:
+            raise NotFound(f"Not found: Table {table_ref}")
+        return SimpleNamespace(full_table_id=f"{project_id}:{dataset_name}.{table_name}")
+
+    def get_dataset(self, dataset_ref: str) -> SimpleNamespace:
+        self._call()
+        return SimpleNamespace(location=self._dataset(dataset_ref).location)
+
+    def query(self, query: str, job_config=None) -> FakeQueryJob:
+        self._call(is_job=True)
+        with self._lock:
+            self.queries.append(query)
+
+        parameters = {
+            p.name: getattr(p, "value", getattr(p, "values", None))
+            for p in getattr(job_config, "query_parameters", None) or []
+        }
+
+        region_match = self.REGION_REF_REGEX.search(query)
+        if region_match:
+            project_id, region, view = region_match.groups()
+            # unrestricted datasets come in @datasets, restricted ones as @dsN with @dsN_* selectors
+            restricted = {value: f"{name}_" for name, value in parameters.items() if re.fullmatch(r"ds\d+", name)}
+            rows = []
+            for (p, name), d in self._datasets.items():
+                if p != project_id or d.location.lower() != region:
+                    continue
+                if name in parameters.get("datasets", []):
+                    rows.extend(self._table_rows(d, view == "TABLE_STORAGE"))
+                elif name in restricted:
+                    rows.extend(
+                        row for row in self._table_rows(d, view == "TABLE_STORAGE")
+                        if self._is_selected(row.fq_table_name.split(".")[-1], parameters, restricted[name])
+                    )
+            return FakeQueryJob(rows)
+
+        match = self.DATASET_REF_REGEX.search(query)
+        if not match:
+            raise ValueError(f"FakeBigQueryClient cannot answer query:\n{query}")
+
+        dataset = self._datasets[(match.group(1), match.group(2))]
+        rows = self._table_rows(dataset, match.group(3) == "__TABLES__", parameters.get("table_name"))
+        return FakeQueryJob([row for row in rows if self._is_selected(row.fq_table_name.split(".")[-1], parameters)])
+
+    @staticmethod
+    def _is_selected(table_name: str, parameters: dict, parameter_prefix: str = "") -> bool:
+        def matches(prefix: str) -> bool:
+            pattern = parameters.get(f"{parameter_prefix}{prefix}_pattern")
+            names = parameters.get(f"{parameter_prefix}{prefix}_names", [])
+            return table_name in names or bool(pattern and re.search(pattern, table_name))
+
+        allow_parameters = {f"{parameter_prefix}allow_names", f"{parameter_prefix}allow_pattern"}
+        is_allowed = matches("allow") if allow_parameters & set(parameters) else True
+        return is_allowed and not matches("block")
+
+    @staticmethod
+    def _table_rows(dataset: FakeDataset, counts: bool, table_name: str = None) -> List[SimpleNamespace]:
+        rows = []
+        for name in dataset.table_names:
+            if table_name is not None and name != table_name:
+                continue
+            fq_table_name = dataset.fq_table_name(name)
+            if counts:
+                rows.append(SimpleNamespace(
+                    fq_table_name=fq_table_name,
+                    dataset_name=dataset.dataset_name,
+                    row_count=dataset.row_count(name),
+                    size_bytes=dataset.size_bytes(name),
+                ))
+            else:
+                rows.append(SimpleNamespace(
+                    fq_table_name=fq_table_name, dataset_name=dataset.dataset_name, ddl=dataset.ddl(name)
+                ))
+
+        return rows
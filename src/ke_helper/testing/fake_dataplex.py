@@ -0,0 +1,210 @@
+"""
+  ------------------------------------------
+  Local stand-in for the Dataplex dataScans REST API
+  ------------------------------------------
+"""
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from .fixtures import FakeDataset
+
+
+def parse_field_mask(mask: str) -> dict:
+    """ "a,b(c,d(e))" -> {"a": None, "b": {"c": None, "d": {"e": None}}} """
+    tree, stack, name = {}, [], ""
+    node = tree
+    for char in mask + ",":
+        if char == "(":
+            node[name] = {}
+            stack.append(node)
+            node, name = node[name], ""
+        elif char in ",)":
+            if name:
+                node[name] = None
+            name = ""
+            if char == ")":
+                node = stack.pop()
+        else:
+            name += char.strip()
+    return tree
+
+
+def apply_field_mask(body, tree: dict):
+    if tree is None:
+        return body
+    if isinstance(body, list):
+        return [apply_field_mask(item, tree) for item in body]
+    if isinstance(body, dict):
+        return {key: apply_field_mask(body[key], sub_tree) for key, sub_tree in tree.items() if key in body}
+    return body
+
+
+class FakeCredentials:
+    """Always-valid credentials so KEAuth never reaches google.auth."""
+    valid = True
+    token = "fake-token"
+
+    def refresh(self, request):
+        pass
+
+
+class FakeDataplexServer:
+    """
+    Serves dataScans.list (paginated) and dataScans.get (basic and FULL views)
+    for one or more FakeDatasets on a local port.
+
+    latency          seconds slept before every response
+    page_size        default number of scans per list page
+    rate_limit_every every Nth request is answered with HTTP 429 (0 disables)
+    field_masks      honour the `fields` parameter; False answers masked requests with HTTP 400
+    """
+
+    def __init__(
+        self,
+        datasets: List[FakeDataset],
+        latency: float = 0.0,
+        page_size: int = 100,
+        rate_limit_every: int = 0,
+        field_masks: bool = True,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ):
+        self.latency = latency
+        self.page_size = page_size
+        self.rate_limit_every = rate_limit_every
+        self.field_masks = field_masks
+
+        # (project, location) -> ordered scans; scan name -> scan
+        self._locations: Dict[Tuple[str, str], List[dict]] = {}
+        self._scans: Dict[str, dict] = {}
+        for dataset in datasets:
+            for scan in dataset.scans.values():
+                key = (dataset.project_id, dataset.location)
+                self._locations.setdefault(key, []).append(scan)
+                self._scans[scan["name"]] = scan
+
+        self._lock = threading.Lock()
+        self.request_count = 0
+        self.bytes_sent = 0
+        self.status_counts = Counter()
+
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def reset_counters(self):
+        with self._lock:
+            self.request_count = 0
+            self.bytes_sent = 0
+            self.status_counts.clear()
+
+    def start(self) -> "FakeDataplexServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    ## Request handling ##
+    def _next_request_is_rate_limited(self) -> bool:
+        with self._lock:
+            self.request_count += 1
+            return bool(self.rate_limit_every) and self.request_count % self.rate_limit_every == 0
+
+    def _record(self, status: int, size: int):
+        with self._lock:
+            self.status_counts[status] += 1
+            self.bytes_sent += size
+
+    def _list(self, project_id: str, location: str, params: dict) -> Tuple[int, dict]:
+        scans = self._locations.get((project_id, location), [])
+        start = int(params.get("pageToken", ["0"])[0] or 0)
+        page_size = int(params.get("pageSize", [self.page_size])[0])
+        page = scans[start:start + page_size]
+
+        body = {"dataScans": [FakeDataset.basic_view(scan) for scan in page]}
+        if start + page_size < len(scans):
+            body["nextPageToken"] = str(start + page_size)
+        return 200, body
+
+    def _get(self, scan_name: str, params: dict) -> Tuple[int, dict]:
+        scan = self._scans.get(scan_name)
+        if scan is None:
+            return 404, {"error": {"code": 404, "message": f"{scan_name} not found", "status": "NOT_FOUND"}}
+        if params.get("view", ["BASIC"])[0] != "FULL":
+            scan = FakeDataset.basic_view(scan)
+        return 200, scan
+
+    def respond(self, path: str, query: str) -> Tuple[int, dict]:
+        """ route a GET request; returns (status, body) """
+        params = parse_qs(query)
+        parts = path.strip("/").split("/")
+
+        status, body = 404, {"error": {"code": 404, "message": f"Unknown path {path}", "status": "NOT_FOUND"}}
+
+        # v1/projects/{project}/locations/{location}/dataScans[/{scan_id}]
+        if len(parts) >= 6 and parts[0] == "v1" and parts[1] == "projects" and parts[5] == "dataScans":
+            if len(parts) == 6:
+                status, body = self._list(parts[2], parts[4], params)
+            if len(parts) == 7:
+                status, body = self._get("/".join(parts[1:]), params)
+
+        if status == 200 and "fields" in params:
+            if not self.field_masks:
+                return 400, {"error": {"code": 400, "message": "Invalid field mask", "status": "INVALID_ARGUMENT"}}
+            body = apply_field_mask(body, parse_field_mask(params["fields"][0]))
+
+        return status, body
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if fake.latency:
+                    time.sleep(fake.latency)
+
+                headers = {}
+                if fake._next_request_is_rate_limited():
+                    status = 429
+                    body = {"error": {"code": 429, "message": "Quota exceeded", "status": "RESOURCE_EXHAUSTED"}}
+                    headers["Retry-After"] = "0"
+                else:
+                    url = urlparse(self.path)
+                    status, body = fake.respond(url.path, url.query)
+
+                payload = json.dumps(body).encode("utf-8")
+                # counted before sending, so counters are settled once the client has the response
+                fake._record(status, len(payload))
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
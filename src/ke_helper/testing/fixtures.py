@@ -0,0 +1,176 @@
+"""
+  ------------------------------------------
+  Synthetic Dataplex DATA_DOCUMENTATION payloads for offline runs
+  ------------------------------------------
+"""
+import uuid
+from typing import Dict, List, Optional
+
+from ..models.common_models import ScanTypeValue
+
+RESOURCE_PREFIX = "//bigquery.googleapis.com"
+SCAN_TIME = "2024-01-01T00:00:00Z"
+
+# Keys only present in the FULL view of a scan
+FULL_VIEW_KEYS = ("dataDocumentationSpec", "dataDocumentationResult")
+
+
+class FakeDataset:
+    """
+    A generated dataset: its BigQuery tables and the FULL view of every
+    DATA_DOCUMENTATION scan Dataplex would hold for it.
+    """
+
+    def __init__(
+        self,
+        project_id: str,
+        dataset_name: str,
+        location: str = "us-central1",
+        n_tables: int = 20,
+        fields_per_table: int = 10,
+        queries_per_table: int = 3,
+        n_relationships: Optional[int] = None,
+        n_stale_scans: int = 0
+    ):
+        self.project_id = project_id
+        self.dataset_name = dataset_name
+        self.location = location
+        self.table_names = [f"table_{i:05d}" for i in range(n_tables)]
+        self.fields_per_table = fields_per_table
+        self.queries_per_table = queries_per_table
+        self.n_relationships = n_tables - 1 if n_relationships is None else n_relationships
+
+        # Scans for tables that were since dropped from BigQuery
+        self.stale_table_names = [f"dropped_{i:05d}" for i in range(n_stale_scans)]
+
+        self.scans: Dict[str, dict] = {}
+        for table_name in self.table_names + self.stale_table_names:
+            scan = self._table_scan(table_name)
+            self.scans[self.scan_id(scan)] = scan
+        scan = self._dataset_scan()
+        self.scans[self.scan_id(scan)] = scan
+
+    ## Naming ##
+    @property
+    def dataset_resource(self) -> str:
+        return f"{RESOURCE_PREFIX}/projects/{self.project_id}/datasets/{self.dataset_name}"
+
+    def table_resource(self, table_name: str) -> str:
+        return f"{self.dataset_resource}/tables/{table_name}"
+
+    def fq_table_name(self, table_name: str) -> str:
+        return f"{self.project_id}.{self.dataset_name}.{table_name}"
+
+    def _scan_name(self, scan_id: str) -> str:
+        return f"projects/{self.project_id}/locations/{self.location}/dataScans/{scan_id}"
+
+    @staticmethod
+    def scan_id(scan: dict) -> str:
+        return scan["name"].split("/")[-1]
+
+    ## Payloads ##
+    def _scan_base(self, scan_id: str, resource: str) -> dict:
+        name = self._scan_name(scan_id)
+        return {
+            "name": name,
+            "uid": str(uuid.uuid5(uuid.NAMESPACE_URL, name)),
+            "state": "ACTIVE",
+            "createTime": SCAN_TIME,
+            "updateTime": SCAN_TIME,
+            "data": {"resource": resource},
+            "executionSpec": {"trigger": {"onDemand": {}}},
+            "executionStatus": {
+                "latestJobStartTime": SCAN_TIME,
+                "latestJobEndTime": SCAN_TIME,
+                "latestJobCreateTime": SCAN_TIME,
+            },
+            "type": ScanTypeValue.DATA_DOCUMENTATION.value,
+            "dataDocumentationSpec": {},
+        }
+
+    def _fields(self, table_name: str) -> List[dict]:
+        return [
+            {"name": f"column_{i}", "description": f"Column {i} of {table_name}."}
+            for i in range(self.fields_per_table)
+        ]
+
+    def _queries(self, table_name: str) -> List[dict]:
+        fq_table_name = self.fq_table_name(table_name)
+        return [
+            {
+                "sql": f"SELECT column_{i}, COUNT(*) FROM `{fq_table_name}` GROUP BY 1",
+                "description": f"Distribution of column_{i} in {table_name}.",
+            }
+            for i in range(self.queries_per_table)
+        ]
+
+    def _table_scan(self, table_name: str) -> dict:
+        scan = self._scan_base(
+            f"dd-{self.dataset_name}-{table_name}".replace("_", "-"),
+            self.table_resource(table_name)
+        )
+        scan["dataDocumentationResult"] = {
+            "overview": f"The {table_name} table.",
+            "schema": {"fields": self._fields(table_name)},
+            "queries": self._queries(table_name),
+        }
+        return scan
+
+    def _relationships(self) -> List[dict]:
+        relationships = []
+        for i in range(min(self.n_relationships, len(self.table_names) - 1)):
+            left, right = self.table_names[i], self.table_names[i + 1]
+            relationships.append({
+                "leftSchemaPaths": {"tableFqn": self.table_resource(left), "paths": ["column_0"]},
+                "rightSchemaPaths": {"tableFqn": self.table_resource(right), "paths": ["column_0"]},
+                "sources": ["SCHEMA_ANALYSIS"],
+                "type": "SCHEMA_JOIN",
+                "confidenceScore": 0.8,
+            })
+        return relationships
+
+    def _dataset_scan(self) -> dict:
+        scan = self._scan_base(f"dd-{self.dataset_name}".replace("_", "-"), self.dataset_resource)
+        dataset_queries = [
+            {"sql": f"SELECT COUNT(*) FROM `{self.fq_table_name(t)}`", "description": f"Rows in {t}."}
+            for t in self.table_names[:5]
+        ]
+        scan["description"] = f"Documentation scan for {self.dataset_name}."
+        scan["displayName"] = self.dataset_name
+        scan["dataDocumentationResult"] = {
+            "queries": dataset_queries,
+            "datasetResult": {
+                "overview": f"The {self.dataset_name} dataset.",
+                "tableResults": [
+                    {
+                        "name": self.fq_table_name(t),
+                        "overview": f"The {t} table.",
+                        "schema": {"fields": self._fields(t)},
+                        "queries": self._queries(t),
+                    }
+                    for t in self.table_names
+                ],
+                "schemaRelationships": self._relationships(),
+                "queries": dataset_queries,
+            },
+        }
+        return scan
+
+    @staticmethod
+    def basic_view(scan: dict) -> dict:
+        """ the scan as returned by dataScans.list (no documentation results) """
+        return {k: v for k, v in scan.items() if k not in FULL_VIEW_KEYS}
+
+    ## BigQuery metadata ##
+    def ddl(self, table_name: str) -> str:
+        columns = ",\n  ".join(f"column_{i} STRING" for i in range(self.fields_per_table))
+        return (
+            f"CREATE TABLE `{self.fq_table_name(table_name)}`\n(\n  {columns}\n)\n"
+            f"PARTITION BY DATE(_PARTITIONTIME)\nCLUSTER BY column_0, column_1;"
+        )
+
+    def row_count(self, table_name: str) -> int:
+        return 1000 * (self.table_names.index(table_name) + 1)
+
+    def size_bytes(self, table_name: str) -> int:
+        return 64 * self.row_count(table_name)
@@ -0,0 +1,85 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ke_helper import KEDatasetScanHelper, KEDatasetDetails
+from src.ke_helper.testing import FakeBigQueryClient, FakeCredentials
+
+
+@pytest.fixture(autouse=True)
+def isolated_helper_state():
+    """ every test starts without scan indexes or field mask rejections left by another """
+    KEDatasetScanHelper.clear_scan_indexes()
+    KEDatasetScanHelper.clear_field_mask_rejections()
+    yield
+    KEDatasetScanHelper.clear_scan_indexes()
+    KEDatasetScanHelper.clear_field_mask_rejections()
+
+
+## Output models ##
+def _make_details(dataset_name: str) -> KEDatasetDetails:
+    shared_query = {"sql": "SELECT id FROM users", "description": "ids"}
+    return KEDatasetDetails(
+        project_id="p",
+        dataset_name=dataset_name,
+        dataset_location="US",
+        dataset_description="A dataset.",
+        dataset_relationships=[{
+            "table1": f"p.{dataset_name}.orders",
+            "table2": f"p.{dataset_name}.users",
+            "relationship": "orders.user_id = users.id",
+            "sources": ["SCHEMA"],
+            "confidence_score": 0.9,
+            "type": "SCHEMA_JOIN",
+        }],
+        dataset_queries=[shared_query],
+        dataset_tables=[
+            {
+                "name": f"p.{dataset_name}.{table}",
+                "overview": f"The {table} table.",
+                "fields": [{"name": "id", "description": "Identifier."}],
+                "queries": [shared_query],
+                "ddl": f"CREATE TABLE {table} (id INT64)",
+                "row_count": 10,
+                "partition_columns": [],
+                "cluster_columns": ["id"],
+            }
+            for table in ("orders", "users")
+        ],
+    )
+
+
+@pytest.fixture
+def make_details():
+    """ make_details(dataset_name) -> a small KEDatasetDetails with two tables and shared values """
+    return _make_details
+
+
+## Helpers against the local fakes ##
+@pytest.fixture
+def helper_kwargs():
+    """ helper_kwargs(server, bq_client, **overrides) -> constructor kwargs for the local fakes """
+    def kwargs(server, bq_client, **overrides) -> dict:
+        return {
+            "credentials": FakeCredentials(),
+            "bq_client": bq_client,
+            "dataplex_base_url": server.base_url,
+            **overrides,
+        }
+    return kwargs
+
+
+@pytest.fixture
+def make_helper(helper_kwargs):
+    """ make_helper(dataset, server, bq_client=None, **overrides) -> KEDatasetScanHelper for a FakeDataset """
+    def make(dataset, server, bq_client=None, **overrides) -> KEDatasetScanHelper:
+        return KEDatasetScanHelper(
+            dataset.project_id,
+            dataset.dataset_name,
+            **helper_kwargs(server, bq_client or FakeBigQueryClient([dataset]), **overrides)
+        )
+    return make
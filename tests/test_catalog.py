@@ -0,0 +1,66 @@
+import sys
+from pathlib import Path
+import pytest
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ke_helper import KECompactCatalog
+from src.ke_helper.catalog import CompactDatasetDetails
+
+
+def test_compact_views_match_output_models(make_details):
+    details = make_details("d1")
+    compact = KECompactCatalog().add(details)
+
+    assert compact.to_model() == details
+    assert compact.dataset_queries_json == details.dataset_queries_json
+    assert compact.dataset_relationships_json == details.dataset_relationships_json
+    assert compact.text_table_ddls == details.text_table_ddls
+
+    table, original = compact.dataset_tables[0], details.dataset_tables[0]
+    assert table.name == original.name
+    assert table.fields_json == original.fields_json
+    assert table.queries_json == original.queries_json
+    assert table.text_field_descriptions == original.text_field_descriptions
+
+    # fingerprints are carried over, so catalog-resident datasets validate like the models
+    assert compact.fingerprint == details.fingerprint
+    assert compact.relationships_fingerprint == details.relationships_fingerprint
+    assert table.fingerprint == original.fingerprint
+    assert compact.dataset_relationships[0].fingerprint == details.dataset_relationships[0].fingerprint
+    assert table.json_bytes("fields") == original.json_bytes("fields")
+    assert compact.json_bytes("dataset_queries") == details.json_bytes("dataset_queries")
+    assert compact.to_model().fingerprint == compact.fingerprint
+
+
+def test_catalog_shares_repeated_values_across_datasets(monkeypatch, make_details):
+    catalog = KECompactCatalog()
+    first = catalog.add(make_details("d1"))
+    second = catalog.add(make_details("d2"))
+
+    assert len(catalog) == 2
+    assert first.dataset_queries[0] is first.dataset_tables[0].queries[0] is second.dataset_tables[1].queries[0]
+    assert first.dataset_tables[0].fields[0] is second.dataset_tables[0].fields[0]
+    assert first.dataset_tables[0].cluster_columns is second.dataset_tables[1].cluster_columns
+    assert catalog.get("p", "d2") is second
+
+    catalog.remove("p", "d1")
+    strings = catalog.stats["strings"]
+    # compact() re-pools the compact records directly, never through the models
+    monkeypatch.setattr(CompactDatasetDetails, "to_model", lambda self: pytest.fail("to_model called"))
+    catalog.compact()
+    monkeypatch.undo()
+    assert catalog.stats["datasets"] == 1
+    assert catalog.stats["strings"] < strings
+    assert catalog.get("p", "d2").to_model() == make_details("d2")
+    assert catalog.get("p", "d2").fingerprint == make_details("d2").fingerprint
+
+
+def test_compact_records_are_read_only(make_details):
+    table = KECompactCatalog().add(make_details("d1")).dataset_tables[0]
+
+    with pytest.raises(AttributeError):
+        table.name = "other"
+    with pytest.raises(AttributeError):
+        table.fields[0].description = "changed"
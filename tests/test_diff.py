@@ -0,0 +1,111 @@
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ke_helper import (
+    KEDatasetDetails,
+    ChangeOp,
+    ChangeEntity,
+    diff_dataset_details,
+    apply_changes,
+)
+
+
+def make_details(**overrides) -> dict:
+    details = {
+        "project_id": "p",
+        "dataset_name": "d",
+        "dataset_location": "us-central1",
+        "dataset_description": "A dataset.",
+        "dataset_relationships": [{
+            "table1": "p.d.orders",
+            "table2": "p.d.users",
+            "relationship": "p.d.orders.user_id = p.d.users.id",
+            "sources": ["SCHEMA"],
+            "confidence_score": 0.9,
+            "type": "SCHEMA_JOIN",
+        }],
+        "dataset_queries": [{"sql": "SELECT 1", "description": "one"}],
+        "dataset_tables": [
+            {
+                "name": "p.d.orders",
+                "overview": "Orders.",
+                "fields": [{"name": "id", "description": "Order id."}, {"name": "user_id", "description": "User."}],
+                "queries": [{"sql": "SELECT * FROM orders", "description": "all"}],
+            },
+            {
+                "name": "p.d.users",
+                "overview": "Users.",
+                "fields": [{"name": "id", "description": "User id."}],
+                "queries": [],
+            },
+        ],
+    }
+    details.update(overrides)
+    return details
+
+
+def test_identical_builds_have_empty_diff():
+    diff = diff_dataset_details(KEDatasetDetails(**make_details()), KEDatasetDetails(**make_details()))
+    assert diff.is_empty
+
+
+def test_diff_reports_table_field_query_and_relationship_changes():
+    old = make_details()
+    new = make_details()
+    new["dataset_tables"][0]["overview"] = "All orders."
+    new["dataset_tables"][0]["fields"][1]["description"] = "Owning user."
+    new["dataset_tables"][0]["fields"].append({"name": "status", "description": "Status."})
+    new["dataset_tables"].pop(1)
+    new["dataset_tables"].append({"name": "p.d.items", "overview": "Items.", "fields": [], "queries": []})
+    new["dataset_queries"] = [{"sql": "SELECT 2", "description": "two"}]
+    new["dataset_relationships"][0]["confidence_score"] = 0.5
+
+    diff = diff_dataset_details(old, new)
+
+    assert diff.tables_added == ["p.d.items"]
+    assert diff.tables_removed == ["p.d.users"]
+    assert diff.tables_changed == ["p.d.orders"]
+
+    ops = {(c.entity, c.op, c.key) for c in diff.changes}
+    assert (ChangeEntity.FIELD, ChangeOp.CHANGED, "user_id") in ops
+    assert (ChangeEntity.FIELD, ChangeOp.ADDED, "status") in ops
+    assert (ChangeEntity.QUERY, ChangeOp.ADDED, "SELECT 2") in ops
+    assert (ChangeEntity.QUERY, ChangeOp.REMOVED, "SELECT 1") in ops
+    assert (ChangeEntity.RELATIONSHIP, ChangeOp.CHANGED, "p.d.orders|p.d.users|p.d.orders.user_id = p.d.users.id") in ops
+
+
+def test_apply_changes_reproduces_new_build():
+    old = make_details()
+    new = make_details(dataset_description="Updated.")
+    new["dataset_tables"][1]["fields"] = [{"name": "email", "description": "Email."}]
+    new["dataset_relationships"] = []
+
+    diff = diff_dataset_details(old, new)
+    applied = apply_changes(KEDatasetDetails(**old), diff.changes)
+
+    assert isinstance(applied, KEDatasetDetails)
+    assert diff_dataset_details(applied, new).is_empty
+    assert applied.dataset_description == "Updated."
+
+
+def test_unchanged_tables_are_skipped_by_fingerprint(monkeypatch):
+    from src.ke_helper import diff as diff_module
+
+    hashed = []
+    real_hash = diff_module._hash
+    monkeypatch.setattr(diff_module, "_hash", lambda value: hashed.append(value) or real_hash(value))
+
+    old = KEDatasetDetails(**make_details())
+    assert diff_dataset_details(old, KEDatasetDetails(**make_details())).is_empty
+    assert hashed == []
+
+    new = make_details()
+    new["dataset_tables"][1]["overview"] = "All users."
+    diff = diff_dataset_details(old, new)
+
+    assert diff.tables_changed == ["p.d.users"]
+    # only the changed table and the dataset queries were hashed, never orders or a relationship
+    assert not any("Orders." in str(value) or "confidence_score" in str(value) for value in hashed)
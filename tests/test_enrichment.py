@@ -0,0 +1,96 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+import pytest
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ke_helper import KEDatasetScanHelper, KEBatchEnrichment, enrich_in_batches
+from src.ke_helper.instrumentation import KEInstrumentation
+from src.ke_helper.testing import FakeDataset, FakeDataplexServer, FakeBigQueryClient, FakeCredentials
+
+PROJECT_ID = "fake-project"
+
+
+@pytest.fixture
+def make_helpers(make_helper):
+    def make(datasets, server, bq_client):
+        return [make_helper(dataset, server, bq_client).with_table_ddls().with_table_counts() for dataset in datasets]
+    return make
+
+
+def test_batch_enrichment_runs_one_query_per_region_and_kind(make_helpers):
+    datasets = [FakeDataset(PROJECT_ID, f"ds_{i}", n_tables=3) for i in range(4)]
+    datasets += [FakeDataset(PROJECT_ID, f"us_{i}", location="US", n_tables=3) for i in range(2)]
+
+    with FakeDataplexServer(datasets) as server:
+        per_dataset_client = FakeBigQueryClient(datasets)
+        expected = [h.dataset_all_details for h in make_helpers(datasets, server, per_dataset_client)]
+
+        bq_client = FakeBigQueryClient(datasets)
+        helpers = make_helpers(datasets, server, bq_client)
+        batches = enrich_in_batches(helpers)
+        details = [h.dataset_all_details for h in helpers]
+
+    assert sorted(batches) == [(PROJECT_ID, "us"), (PROJECT_ID, "us-central1")]
+    assert batches[(PROJECT_ID, "us-central1")].datasets == ["ds_0", "ds_1", "ds_2", "ds_3"]
+    assert per_dataset_client.job_count == 2 * len(datasets)
+    assert bq_client.job_count == 4
+    assert all("region-" in query for query in bq_client.queries)
+    assert details == expected
+
+
+def test_batch_enrichment_must_match_project_and_location():
+    dataset = FakeDataset(PROJECT_ID, "ds", n_tables=1)
+    helper = KEDatasetScanHelper(
+        PROJECT_ID, "ds", credentials=FakeCredentials(), bq_client=FakeBigQueryClient([dataset])
+    )
+
+    with pytest.raises(ValueError):
+        helper.with_batch_enrichment(KEBatchEnrichment(PROJECT_ID, "EU"))
+    with pytest.raises(ValueError):
+        helper.with_batch_enrichment(KEBatchEnrichment("other-project", "us-central1"))
+
+
+def test_batch_enrichment_handles_domain_scoped_projects():
+    project_id = "example.com:proj"
+    datasets = [FakeDataset(project_id, f"ds_{i}", n_tables=2) for i in range(2)]
+    bq_client = FakeBigQueryClient(datasets)
+    batch = KEBatchEnrichment(project_id, "us-central1", bq_client)
+    for dataset in datasets:
+        batch.register(dataset.dataset_name)
+
+    for dataset in datasets:
+        helper = SimpleNamespace(
+            dataset_name=dataset.dataset_name, table_selector=None, instrumentation=KEInstrumentation()
+        )
+        ddls = batch.table_ddls(helper)
+        assert sorted(ddls) == [dataset.fq_table_name(name) for name in dataset.table_names]
+        assert batch.table_counts(helper)[dataset.fq_table_name(dataset.table_names[0])]["row_count"] is not None
+
+    assert bq_client.job_count == 2
+
+
+def test_batch_enrichment_pushes_each_dataset_selection_into_the_region_query(make_helpers):
+    datasets = [FakeDataset(PROJECT_ID, f"ds_{i}", n_tables=6) for i in range(3)]
+
+    with FakeDataplexServer(datasets) as server:
+        per_dataset_client = FakeBigQueryClient(datasets)
+        bq_client = FakeBigQueryClient(datasets)
+
+        def configure(helpers):
+            helpers[0].with_table_list_constraints(blocklist=["table_0000[0-3]"])
+            helpers[1].with_table_list_constraints(allowlist=["table_00001", "re:5$"])
+            return helpers
+
+        expected = [h.dataset_all_details for h in configure(make_helpers(datasets, server, per_dataset_client))]
+        helpers = make_helpers(datasets, server, bq_client)
+        batch = enrich_in_batches(helpers)[(PROJECT_ID, "us-central1")]
+        details = [h.dataset_all_details for h in configure(helpers)]
+
+    assert details == expected
+    assert bq_client.job_count == 2
+    assert all("table_schema = @ds0" in query and "@ds1_allow_pattern" in query for query in bq_client.queries)
+    # only selected tables were read from the region
+    assert sorted(len(batch.table_ddls(helper)) for helper in helpers) == [2, 2, 6]
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+
+def loaded_after(statement: str) -> set:
+    probe = (
+        f"{statement}\n"
+        "import sys\n"
+        "print(' '.join(m for m in ('google.cloud.bigquery', 'google.auth', 'requests', 'pydantic') if m in sys.modules))"
+    )
+    env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+    output = subprocess.run([sys.executable, "-c", probe], env=env, check=True, capture_output=True, text=True).stdout
+    return set(output.split())
+
+
+def test_package_import_is_lazy():
+    assert loaded_after("import ke_helper") == set()
+
+
+def test_helper_import_defers_google_dependencies():
+    assert loaded_after("from ke_helper import KEDatasetScanHelper, KEDatasetDetails") == {"pydantic"}
+
+
+def test_lazy_names_resolve():
+    loaded_after(
+        "import ke_helper\n"
+        "for name in ke_helper.__all__: getattr(ke_helper, name)\n"
+        "assert ke_helper.Query is ke_helper.models.output_models.Query"
+    )
@@ -0,0 +1,404 @@
+import sys
+from pathlib import Path
+import pytest
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ke_helper import (
+    KEDatasetScanHelper,
+    KECassette,
+    CassetteMissError,
+    KEListener,
+    KEBuildCache,
+    NoDDScanFoundException,
+    get_table_documentation,
+)
+from pydantic import ValidationError
+
+from src.ke_helper import constants
+from src.ke_helper.authentication import APIRequestError
+from src.ke_helper import DDDatasetScan, DDTableScan
+from src.ke_helper.testing import (
+    FakeDataset,
+    FakeDataplexServer,
+    FakeBigQueryClient,
+)
+
+PROJECT_ID = "fake-project"
+DATASET_NAME = "fake_dataset"
+
+
+def test_dataset_all_details_offline(make_helper):
+    dataset = FakeDataset(PROJECT_ID, DATASET_NAME, n_tables=12, n_stale_scans=3)
+    bq_client = FakeBigQueryClient([dataset])
+
+    with FakeDataplexServer([dataset], page_size=5, rate_limit_every=4) as server:
+        details = (
+            make_helper(dataset, server, bq_client)
+            .with_table_list_constraints(blocklist=["table_00003"])
+            .with_table_ddls(True)
+            .with_table_counts(True)
+        ).dataset_all_details
+
+        assert server.status_counts[429] > 0
+
+    table_names = [table.name for table in details.dataset_tables]
+    assert len(table_names) == 11
+    assert f"{PROJECT_ID}.{DATASET_NAME}.table_00003" not in table_names
+    assert not any("dropped_" in name for name in table_names)
+
+    assert details.dataset_location == "us-central1"
+    assert details.dataset_description
+    assert len(details.dataset_queries) == 5
+    assert all("table_00003" not in r.relationship for r in details.dataset_relationships)
+
+    for table in details.dataset_tables:
+        assert table.ddl.startswith("CREATE TABLE")
+        assert table.row_count > 0
+        assert table.cluster_columns == ["column_0", "column_1"]
+
+    assert bq_client.job_count == 2
+
+
+def test_fake_server_paginates_list(make_helper):
+    dataset = FakeDataset(PROJECT_ID, DATASET_NAME, n_tables=30)
+
+    with FakeDataplexServer([dataset], page_size=7) as server:
+        scans = make_helper(dataset, server)._list_data_scans()
+        assert server.request_count == 5
+
+    assert len(scans) == 31
+    assert all("dataDocumentationResult" not in scan for scan in scans)
+
+
+def test_cassette_record_and_replay(tmp_path, make_helper):
+    dataset = FakeDataset(PROJECT_ID, DATASET_NAME, n_tables=5)
+    cassette_path = str(tmp_path / "thelook.json.gz")
+
+    with FakeDataplexServer([dataset]) as server:
+        base_url = server.base_url
+        with KECassette(cassette_path, mode=KECassette.RECORD) as cassette:
+            recorded = (
+                make_helper(dataset, server)
+                .with_cassette(cassette)
+                .with_table_ddls(True)
+                .with_table_counts(True)
+            ).dataset_all_details
+
+    # No server, no BigQuery client and no credentials on replay
+    replayed = (
+        KEDatasetScanHelper(PROJECT_ID, DATASET_NAME, dataplex_base_url=base_url)
+        .with_cassette(KECassette(cassette_path))
+        .with_table_ddls(True)
+        .with_table_counts(True)
+    ).dataset_all_details
+
+    assert replayed == recorded
+
+    with pytest.raises(CassetteMissError):
+        KEDatasetScanHelper(PROJECT_ID, "other").with_cassette(KECassette(cassette_path)).dataset_location
+
+
+def test_cassette_replays_recorded_errors(tmp_path, make_helper):
+    dataset = FakeDataset(PROJECT_ID, DATASET_NAME, n_tables=3)
+    cassette_path = str(tmp_path / "rejected_masks.json.gz")
+
+    # the endpoint rejects field masks: the 400s and the fallbacks are recorded
+    with FakeDataplexServer([dataset], field_masks=False) as server:
+        base_url = server.base_url
+        with KECassette(cassette_path, mode=KECassette.RECORD) as cassette:
+            recorded = (
+                make_helper(dataset, server)
+                .with_cassette(cassette)
+                .with_outputs([constants.OUTPUT_TABLE_FIELDS])
+            ).dataset_all_details
+        assert server.status_counts[400] > 0
+
+    # replay the rejection itself rather than the remembered outcome
+    KEDatasetScanHelper.clear_field_mask_rejections()
+    replayed = (
+        KEDatasetScanHelper(PROJECT_ID, DATASET_NAME, dataplex_base_url=base_url)
+        .with_cassette(KECassette(cassette_path))
+        .with_outputs([constants.OUTPUT_TABLE_FIELDS])
+    ).dataset_all_details
+
+    assert replayed == recorded
+
+
+def test_cassette_rebuilds_only_known_error_types(monkeypatch):
+    from google.api_core.exceptions import NotFound
+    from src.ke_helper import cassette as cassette_module
+
+    imported = []
+    import_module = cassette_module.importlib.import_module
+    monkeypatch.setattr(
+        cassette_module.importlib, "import_module", lambda name: imported.append(name) or import_module(name)
+    )
+
+    def rebuild(error_type: str, status_code=None):
+        return cassette_module._error_from_dict({"type": error_type, "message": "boom", "status_code": status_code})
+
+    assert isinstance(rebuild("google.api_core.exceptions.NotFound"), NotFound)
+    assert type(rebuild(f"{APIRequestError.__module__}.APIRequestError", 400)).__name__ == "APIRequestError"
+    assert rebuild(f"{APIRequestError.__module__}.APIRequestError", 400).status_code == 400
+
+    # anything else is not imported, let alone instantiated
+    imported.clear()
+    for error_type in ("subprocess.CalledProcessError", "os.system", "builtins.ValueError"):
+        error = rebuild(error_type, 500)
+        assert isinstance(error, APIRequestError) and error.status_code == 500
+    assert imported == []
+
+
+def test_metrics_report_and_listener(make_helper):
+    dataset = FakeDataset(PROJECT_ID, DATASET_NAME, n_tables=6)
+
+    class Recorder(KEListener):
+        def __init__(self):
+            self.spans = []
+            self.events = []
+
+        def on_span_end(self, span):
+            self.spans.append(span.name)
+
+        def on_event(self, name, attributes):
+            self.events.append(name)
+
+    with FakeDataplexServer([dataset], rate_limit_every=3) as server:
+        helper = make_helper(dataset, server).with_table_ddls(True).with_table_counts(True)
+        recorder = Recorder()
+        helper.instrumentation.add_listener(recorder)
+        helper.dataset_all_details
+
+    metrics = helper.metrics
+    assert metrics.phases["fetch_full_scan"].count == 7
+    assert metrics.phases["dataset_all_details"].count == 1
+    assert metrics.http_requests == server.request_count
+    assert metrics.http_status_codes[429] == metrics.retries > 0
+    assert metrics.bigquery_jobs == 2
+    assert metrics.cache_hits["table_ddls"] == 5
+    assert "dataset_all_details" in metrics.summary
+
+    assert recorder.spans[-1] == "dataset_all_details"
+    assert "retry" in recorder.events
+
+
+def test_partial_responses_fetch_only_requested_outputs(make_helper):
+    dataset = FakeDataset(PROJECT_ID, DATASET_NAME, n_tables=8)
+
+    with FakeDataplexServer([dataset]) as server:
+        full = make_helper(dataset, server).dataset_all_details
+        full_bytes = server.bytes_sent
+        server.reset_counters()
+
+        partial = (
+            make_helper(dataset, server)
+            .with_outputs([constants.OUTPUT_TABLE_FIELDS, constants.OUTPUT_RELATIONSHIPS])
+        ).dataset_all_details
+        assert server.bytes_sent < full_bytes
+
+    assert [t.name for t in partial.dataset_tables] == [t.name for t in full.dataset_tables]
+    assert [t.fields for t in partial.dataset_tables] == [t.fields for t in full.dataset_tables]
+    assert all(t.overview and t.queries == [] for t in partial.dataset_tables)
+    assert partial.dataset_relationships == full.dataset_relationships
+    assert partial.dataset_queries == []
+    assert partial.dataset_description == full.dataset_description
+
+
+def test_partial_responses_fall_back_to_full_view(make_helper):
+    dataset = FakeDataset(PROJECT_ID, DATASET_NAME, n_tables=3)
+
+    with FakeDataplexServer([dataset], field_masks=False) as server:
+        details = make_helper(dataset, server).with_outputs([constants.OUTPUT_TABLE_QUERIES]).dataset_all_details
+
+        # only the first masked request (the listing) is rejected; the listing and
+        # four scans are then fetched in full
+        assert server.status_counts[400] == 1
+        assert server.request_count == 6
+
+        # the endpoint is remembered: another helper goes straight to the full view
+        server.reset_counters()
+        make_helper(dataset, server).with_outputs([constants.OUTPUT_TABLE_QUERIES]).dataset_all_details
+        assert server.status_counts[400] == 0
+
+    assert all(t.queries for t in details.dataset_tables)
+
+    with pytest.raises(ValueError):
+        make_helper(dataset, server).with_outputs(["glossary"])
+
+
+def test_unrelated_bad_requests_keep_field_masks(make_helper):
+    dataset = FakeDataset(PROJECT_ID, DATASET_NAME, n_tables=3)
+
+    with FakeDataplexServer([dataset]) as server:
+        respond = server.respond
+
+        def bad_location(path, query):
+            if path.endswith("/dataScans"):
+                return 400, {"error": {"code": 400, "message": "Invalid location", "status": "INVALID_ARGUMENT"}}
+            return respond(path, query)
+
+        # masked and unmasked listings both fail: the error is raised, masks stay on
+        server.respond = bad_location
+        with pytest.raises(APIRequestError):
+            make_helper(dataset, server).with_outputs([constants.OUTPUT_TABLE_QUERIES]).dataset_all_details
+        assert server.status_counts[400] == 2
+        assert server.base_url not in KEDatasetScanHelper._field_masks_rejected
+
+        server.respond = respond
+        server.reset_counters()
+        details = make_helper(dataset, server).with_outputs([constants.OUTPUT_TABLE_QUERIES]).dataset_all_details
+        assert server.status_counts[400] == 0 and server.request_count == 5
+
+    assert all(t.queries and not t.fields for t in details.dataset_tables)
+
+
+def test_incomplete_partial_responses_fall_back_to_full_view(make_helper):
+    dataset = FakeDataset(PROJECT_ID, DATASET_NAME, n_tables=3)
+
+    with FakeDataplexServer([dataset]) as server:
+        respond = server.respond
+
+        def drop_requested_schema(path, query):
+            status, body = respond(path, query)
+            if "fields=" in query and "schema" in body.get("dataDocumentationResult", {}):
+                body = {**body, "dataDocumentationResult": {
+                    k: v for k, v in body["dataDocumentationResult"].items() if k != "schema"
+                }}
+            return status, body
+
+        server.respond = drop_requested_schema
+        details = make_helper(dataset, server).with_outputs([constants.OUTPUT_TABLE_FIELDS]).dataset_all_details
+
+    # the requested schema was missing, so each table was refetched in full
+    assert all(t.fields for t in details.dataset_tables)
+
+    # a FULL response missing required fields does not validate
+    scan = next(iter(dataset.scans.values()))
+    broken = {**scan, "dataDocumentationResult": {"overview": "no schema"}}
+    with pytest.raises(ValidationError):
+        DDTableScan(**broken)
+
+
+def test_table_documentation_point_lookup(make_helper, helper_kwargs):
+    dataset = FakeDataset(PROJECT_ID, DATASET_NAME, n_tables=40, n_stale_scans=1)
+    bq_client = FakeBigQueryClient([dataset])
+
+    with FakeDataplexServer([dataset], page_size=10) as server:
+        lookup = lambda table_name, with_ddl=True: get_table_documentation(
+            PROJECT_ID, DATASET_NAME, table_name,
+            dataset_location=dataset.location,
+            with_ddl=with_ddl,
+            with_counts=True,
+            **helper_kwargs(server, bq_client),
+        )
+
+        first = lookup("table_00007")
+        assert server.request_count == 6 # five list pages (41 scans), one scan
+
+        server.reset_counters()
+        second = lookup("table_00031")
+        assert server.request_count == 1
+
+        # without the shared index the location is listed again
+        KEDatasetScanHelper.clear_scan_indexes()
+        server.reset_counters()
+        lookup("table_00031")
+        assert server.request_count == 6
+
+        with pytest.raises(NoDDScanFoundException):
+            lookup("missing_table")
+
+        assert bq_client.request_count == 6 # one filtered DDL and count query per lookup
+
+        # dropped from BigQuery, but Dataplex still has its scan
+        bq_client.reset_counters()
+        server.reset_counters()
+        for with_ddl in (True, False):
+            with pytest.raises(NoDDScanFoundException):
+                lookup("dropped_00000", with_ddl=with_ddl)
+        assert server.request_count == 0
+        assert bq_client.request_count == 2 # an empty DDL query, then a get_table
+
+        with pytest.raises(NoDDScanFoundException):
+            make_helper(dataset, server, bq_client, dataset_location=dataset.location).with_table_list_constraints(blocklist=["table_000*"]).table_documentation("table_00007")
+
+    assert first.name == f"{PROJECT_ID}.{DATASET_NAME}.table_00007"
+    assert first.row_count == dataset.row_count("table_00007")
+    assert second.ddl == dataset.ddl("table_00031")
+    assert len(second.fields) == dataset.fields_per_table
+
+
+def test_build_cache_skips_unchanged_tables(make_helper):
+    dataset = FakeDataset(PROJECT_ID, DATASET_NAME, n_tables=6)
+    build_cache = KEBuildCache()
+
+    def build(server, with_counts=True):
+        return (
+            make_helper(dataset, server)
+            .with_build_cache(build_cache)
+            .with_table_ddls()
+            .with_table_counts(with_counts)
+        ).dataset_all_details
+
+    with FakeDataplexServer([dataset]) as server:
+        first = build(server)
+        assert len(build_cache) == 6
+
+        # unchanged: only the listing and the dataset scan are fetched
+        server.reset_counters()
+        helper = make_helper(dataset, server).with_build_cache(build_cache).with_table_ddls().with_table_counts()
+        second = helper.dataset_all_details
+        assert server.request_count == 2
+        assert second.fingerprint == first.fingerprint
+        # cache hits are built in dataset_tables; dataplex_scans holds only fetched scans
+        assert [type(scan) for scan in helper.dataplex_scans] == [DDDatasetScan]
+        assert all(a is b for a, b in zip(first.dataset_tables, second.dataset_tables))
+
+        # one table scan ran a new job with a new overview
+        scan = dataset.scans[FakeDataset.scan_id(dataset._table_scan("table_00002"))]
+        scan["updateTime"] = "2024-02-01T00:00:00Z"
+        scan["dataDocumentationResult"]["overview"] = "Rewritten."
+        server.reset_counters()
+        third = build(server)
+        assert server.request_count == 3
+        changed = [t.name for a, t in zip(second.dataset_tables, third.dataset_tables) if a.fingerprint != t.fingerprint]
+        assert changed == [f"{PROJECT_ID}.{DATASET_NAME}.table_00002"]
+        assert third.fingerprint != second.fingerprint
+
+        # enrichment changed, scans did not: tables are updated without fetching them
+        server.reset_counters()
+        fourth = build(server, with_counts=False)
+        assert server.request_count == 2
+        assert all(t.row_count is None and t.ddl for t in fourth.dataset_tables)
+        assert [t.overview for t in fourth.dataset_tables] == [t.overview for t in third.dataset_tables]
+
+        # deselected tables leave the cache with the next build
+        make_helper(dataset, server).with_build_cache(build_cache).with_table_ddls().with_table_list_constraints(
+            blocklist=["table_00004", "table_00005"]
+        ).dataset_all_details
+        assert len(build_cache) == 4
+
+
+def test_table_patterns_apply_before_validation_and_in_bigquery(make_helper):
+    dataset = FakeDataset(PROJECT_ID, DATASET_NAME, n_tables=30, n_stale_scans=5)
+    bq_client = FakeBigQueryClient([dataset])
+
+    with FakeDataplexServer([dataset]) as server:
+        helper = (
+            make_helper(dataset, server, bq_client)
+            .with_table_list_constraints(allowlist=["table_0000?", "^table_0001[0-4]"], blocklist=["table_00003"])
+            .with_table_ddls()
+            .with_table_counts()
+        )
+        details = helper.dataset_all_details
+
+    expected = [f"table_{i:05d}" for i in list(range(10)) + list(range(10, 15)) if i != 3]
+    assert [t.name.split(".")[-1] for t in details.dataset_tables] == expected
+    assert all(t.ddl and t.row_count for t in details.dataset_tables)
+
+    # DataScan validation: selected tables plus the dataset scan only
+    assert helper.metrics.phases["validate"].count == 2 * len(expected) + 2
+    assert all("WHERE" in query and "REGEXP_CONTAINS" in query for query in bq_client.queries)
+    assert len(helper.table_counts) == len(helper.table_ddls) == len(expected)
@@ -0,0 +1,113 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ke_helper import KEDatasetScanHelper, KEPrefetchScheduler
+from src.ke_helper.testing import FakeDataset, FakeDataplexServer, FakeBigQueryClient
+
+PROJECT_ID = "fake-project"
+
+
+def wait_for(condition, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached in time"
+        time.sleep(0.01)
+
+
+def test_prefetch_builds_in_background_and_rebuilds_on_new_scan_jobs(helper_kwargs):
+    dataset = FakeDataset(PROJECT_ID, "warm", n_tables=4)
+    bq_client = FakeBigQueryClient([dataset])
+
+    with FakeDataplexServer([dataset]) as server:
+        scheduler = KEPrefetchScheduler(refresh_seconds=3600, check_seconds=0.05, jitter_seconds=0).add(
+            PROJECT_ID,
+            "warm",
+            configure=lambda helper: helper.with_table_ddls(),
+            **helper_kwargs(server, bq_client),
+        )
+        with scheduler:
+            details = scheduler.get(PROJECT_ID, "warm", wait=10)
+            assert len(details.dataset_tables) == 4
+            assert details.dataset_tables[0].ddl
+
+            # unchanged scans: checks run, nothing is rebuilt
+            time.sleep(0.3)
+            status = scheduler.status[0]
+            assert status.builds == 1 and status.last_error is None
+            assert scheduler.get(PROJECT_ID, "warm") is details
+
+            # a documentation scan finishes a new job
+            scan = next(iter(dataset.scans.values()))
+            scan["executionStatus"]["latestJobEndTime"] = "2024-02-01T00:00:00Z"
+            wait_for(lambda: scheduler.status[0].builds == 2)
+
+        assert scheduler.status[0].scan_version == "2024-02-01T00:00:00Z"
+        assert scheduler.get(PROJECT_ID, "warm") is not details
+        # the location found by the first build is reused afterwards
+        assert scheduler.status[0].last_metrics.cache_misses.get("dataset_location") is None
+
+
+def test_prefetch_limits_concurrent_builds(helper_kwargs):
+    datasets = [FakeDataset(PROJECT_ID, f"ds_{i}", n_tables=2) for i in range(4)]
+    bq_client = FakeBigQueryClient(datasets)
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    class TrackingHelper(KEDatasetScanHelper):
+        @property
+        def dataset_all_details(self):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            try:
+                time.sleep(0.05)
+                return super().dataset_all_details
+            finally:
+                with lock:
+                    running[0] -= 1
+
+    with FakeDataplexServer(datasets) as server:
+        scheduler = KEPrefetchScheduler(check_seconds=None, max_workers=2, helper_class=TrackingHelper)
+        for dataset in datasets:
+            scheduler.add(
+                PROJECT_ID,
+                dataset.dataset_name,
+                **helper_kwargs(server, bq_client),
+            )
+
+        futures = [scheduler.refresh(PROJECT_ID, d.dataset_name) for d in datasets]
+        results = [future.result(timeout=10) for future in futures]
+        scheduler.stop()
+
+    assert [r.dataset_name for r in results] == [d.dataset_name for d in datasets]
+    assert peak[0] == 2
+
+
+def test_scan_checks_compare_times_and_share_location_listings(make_helper):
+    datasets = [FakeDataset(PROJECT_ID, f"loc_{i}", n_tables=2) for i in range(2)]
+    bq_client = FakeBigQueryClient(datasets)
+
+    with FakeDataplexServer(datasets) as server:
+        def helper(dataset):
+            return make_helper(dataset, server, bq_client, dataset_location=dataset.location)
+
+        # later instants that sort lower as strings, and an earlier one that sorts higher
+        first, second, third = (scan["executionStatus"] for scan in list(datasets[0].scans.values())[:3])
+        first["latestJobEndTime"] = "2024-02-01T00:00:00Z"
+        second["latestJobEndTime"] = "2024-02-01T00:00:00.5Z"
+        third["latestJobEndTime"] = "2024-02-01T01:00:00.123456789+02:00"
+        assert helper(datasets[0]).latest_scan_end_time() == "2024-02-01T00:00:00.5Z"
+
+        # one listing serves every dataset of the location within max_age
+        server.reset_counters()
+        assert helper(datasets[0]).latest_scan_end_time(max_age=60) == "2024-02-01T00:00:00.5Z"
+        helper(datasets[1]).latest_scan_end_time(max_age=60)
+        assert server.request_count == 0
+
+        helper(datasets[1]).latest_scan_end_time(max_age=0)
+        assert server.request_count == 1
@@ -0,0 +1,75 @@
+import json
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ke_helper import serialization
+
+
+def test_json_fields_encode_subtree_once_per_instance(make_details):
+    details = make_details("d1")
+
+    first = details.json_bytes("dataset_relationships")
+    assert details.json_bytes("dataset_relationships") is first
+    assert json.loads(details.dataset_relationships_json) == details.model_dump()["dataset_relationships"]
+    assert "dataset_tables" not in details._json_cache
+
+    table = details.dataset_tables[0]
+    assert json.loads(table.fields_json) == [{"name": "id", "description": "Identifier."}]
+
+    # reading a *_json property fills the cache but does not change equality
+    same = make_details("d1")
+    assert same.dataset_relationships_json and same.dataset_tables[0].fields_json
+    assert details == same and same == details
+    assert details.dataset_tables[0] == same.dataset_tables[0]
+    assert details != make_details("d2")
+
+    renamed = details.model_copy(update={"dataset_relationships": []})
+    assert renamed.dataset_relationships_json == "[]"
+    assert details.json_bytes("dataset_relationships") is first
+
+
+def test_stdlib_fallback_matches_fast_backend(monkeypatch):
+    value = [{"name": "naïve \"quote\"", "description": None, "score": 0.5, "tags": ["a", "b"]}]
+    fast = serialization.dumps(value)
+
+    monkeypatch.setattr(serialization, "_backend", False)
+    assert serialization.json_backend() is None
+    assert serialization.dumps(value) == fast
+    assert json.loads(fast) == value
+
+    # float spelling differs between backends (0.00005 / 5e-05); the values do not
+    floats = {"small": 5e-05, "tiny": 1e-07, "large": 1e20}
+    assert json.loads(serialization.dumps(floats)) == floats
+    monkeypatch.setattr(serialization, "_backend", None)
+    assert json.loads(serialization.dumps(floats)) == floats
+
+
+def test_fingerprints_are_stable_and_content_based(make_details):
+    details, same = make_details("d1"), make_details("d1")
+    assert details.fingerprint == same.fingerprint
+    assert details.relationships_fingerprint == same.relationships_fingerprint
+    assert details.dataset_tables[0].fingerprint == same.dataset_tables[0].fingerprint
+    assert details.dataset_tables[0].fingerprint != details.dataset_tables[1].fingerprint
+
+    table = details.dataset_tables[0].model_copy(update={"row_count": 11})
+    assert table.fingerprint != details.dataset_tables[0].fingerprint
+
+    updated = details.model_copy(update={"dataset_tables": [table, details.dataset_tables[1]]})
+    assert updated.fingerprint != details.fingerprint
+    assert updated.relationships_fingerprint == details.relationships_fingerprint
+
+
+def test_fingerprints_do_not_depend_on_the_json_backend(monkeypatch, make_details):
+    def build():
+        details = make_details("d1")
+        relationship = details.dataset_relationships[0].model_copy(update={"confidence_score": 5e-05})
+        return details.model_copy(update={"dataset_relationships": [relationship]})
+
+    fast = build()
+    monkeypatch.setattr(serialization, "_backend", False)
+    stdlib = build()
+    assert stdlib.fingerprint == fast.fingerprint
+    assert stdlib.relationships_fingerprint == fast.relationships_fingerprint
@@ -0,0 +1,54 @@
+import re
+import sys
+from pathlib import Path
+import pytest
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ke_helper import KETableSelector
+
+
+def test_selector_matches_names_globs_and_regexes():
+    selector = KETableSelector(
+        allowlist=["users", "events_2024*", "shard_[0-4]?", re.compile(r"^tmp_\d+$")],
+        blocklist=["events_2024_12", "^.*_backup$"],
+    )
+
+    assert selector.allows("users")
+    assert selector.allows("events_2024_01")
+    assert selector.allows("shard_3a")
+    assert selector.allows("tmp_42")
+    assert not selector.allows("events_2024_12")
+    assert not selector.allows("events_2024_01_backup")
+    assert not selector.allows("shard_5a")
+    assert not selector.allows("tmp_x")
+    assert not selector.allows("users_v2")
+    assert KETableSelector().allows("anything")
+
+
+def test_selector_sql_filter_uses_one_pattern_per_list():
+    condition, parameters = KETableSelector(["users", "events_*"], ["^tmp_"]).sql_filter("table_name")
+
+    assert condition == (
+        "(table_name IN UNNEST(@allow_names) OR REGEXP_CONTAINS(table_name, @allow_pattern))"
+        " AND NOT (REGEXP_CONTAINS(table_name, @block_pattern))"
+    )
+    values = {p.name: getattr(p, "value", getattr(p, "values", None)) for p in parameters}
+    assert values == {"allow_names": ["users"], "allow_pattern": "(?:^events_.*$)", "block_pattern": "(?:^tmp_)"}
+    assert KETableSelector().sql_filter("table_name") == ("", [])
+
+
+def test_selector_keeps_regex_flags_and_rejects_ambiguous_entries():
+    selector = KETableSelector(allowlist=[re.compile(r"^tmp_", re.IGNORECASE), "re:(?i)_backup$"])
+
+    assert selector.allow.pattern == "(?:(?i:^tmp_))|(?:(?i:_backup$))"
+    assert selector.allows("TMP_1")
+    assert selector.allows("Orders_BACKUP")
+    assert not selector.allows("orders")
+
+    for ambiguous in [".*_backup$", "events.2024", "a|b"]:
+        with pytest.raises(ValueError, match="re:"):
+            KETableSelector(blocklist=[ambiguous])
+    with pytest.raises(ValueError, match="VERBOSE"):
+        KETableSelector([re.compile(r"^tmp_ \d+", re.VERBOSE)])